@@ -3,24 +3,46 @@
 EcoSnake Game - Main Entry Point
 """
 
-import pygame
+import argparse
+import json
 import os
 import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Keep stdout clean for --headless reports
+import pygame
 from constants import *
 from game_state import GameState
-from game_objects import TrashCollector, Trash
+from engine import GameEngine, UP, DOWN, LEFT, RIGHT
 from menus import *
+from renderer import DirtyRectRenderer
+from sprites import SpriteManager, convert_for_display
+from assets import AssetLoader, AssetCache, LazyAssets
+from asset_pack import AssetPack
+from highscores import open_score_store
+from writer import BackgroundWriter
+from replay import Replay, ReplayRecorder
+from verify import verify_replay, ScoreRejected
+from text_cache import render_text
+from perf import FrameProfiler
 
 
-# Change to script directory
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
-pygame.init()
+# Assets, settings, scores and replays are relative to the game's directory
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+}
 
 
 class Game:
     """Main game class that manages all game objects and flow"""
     
-    def __init__(self):
+    def __init__(self, perf=False):
+        pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("EcoSnake-Game")
         self.clock = pygame.time.Clock()
@@ -30,43 +52,93 @@ class Game:
         self.large_font = pygame.font.Font(None, 48)
         self.small_font = pygame.font.Font(None, 24)
         
-        # Game state
-        self.game_state = GameState()
+        # Score and settings writes run on a background thread; safe_exit flushes them
+        self.save_error = None
+        self.score_count = 0
+        self.last_replay = None
+        self.engine = None  # The current (or last) session's engine
+        self.writer = BackgroundWriter(on_error=self._on_write_error)
+        register_exit_hook(self.writer.close)
+        self.score_store = open_score_store()
+        
+        # Game state (the saved character decides which sprite loads first)
+        self.game_state = GameState(self.writer)
+        self.game_state.load_settings()
         
         # Load sprites
         self._load_sprites()
+        
+        self.renderer = DirtyRectRenderer(self.screen)
+        
+        # Frame profiling (per session when enabled); F3 shows it in the HUD
+        self.perf = perf
+        self.profiler = None
+        self.perf_overlay = False
+        self.perf_text = ''
+        self.perf_text_due = 0
     
     def _load_sprites(self):
         """Load and organize all game sprites"""
+        # Decode on a thread pool: the selected character first, then the other
+        # small sprites, then background thumbnails and the selected background,
+        # which keep loading after the menu is up
+        self.asset_pack = AssetPack.open()
+        self.asset_loader = AssetLoader()
+        small_sprites = sorted(CHARACTERS_CONFIG, key=lambda char: char['name'] != self.game_state.selected_character)
+        small_sprites += TRASH_ITEMS_CONFIG + GARBAGE_BAGS_CONFIG
+        for item in small_sprites:
+            self.asset_loader.submit(item['name'], self._load_sprite, item['sprite'])
+        image_backgrounds = [bg for bg in BACKGROUNDS_CONFIG if bg['sprite'] is not None]
+        for bg in image_backgrounds:
+            self.asset_loader.submit(bg['name'], self._load_sprite, bg['sprite'], (LARGE_SPRITE_SIZE, LARGE_SPRITE_SIZE))
+        
+        # Small sprites share one display-format atlas
+        self.sprite_manager = SpriteManager()
+        for item in small_sprites:
+            self.sprite_manager.add(item['name'], self.asset_loader.result(item['name']))
+        self.sprite_manager.build()
+        
         self.characters = {
-            char['name']: self._load_sprite(char['sprite']) 
+            char['name']: self.sprite_manager.get(char['name'])
             for char in CHARACTERS_CONFIG
         }
         
         self.trash_sprites = {
-            item['name']: self._load_sprite(item['sprite'])
+            item['name']: self.sprite_manager.get(item['name'])
             for item in TRASH_ITEMS_CONFIG
         }
         
         self.garbage_bags = {
-            bag['name']: self._load_sprite(bag['sprite'])
+            bag['name']: self.sprite_manager.get(bag['name'])
             for bag in GARBAGE_BAGS_CONFIG
         }
         
-        self.backgrounds = {
-            bg['name']: self._load_sprite(bg['sprite'], (WINDOW_WIDTH, WINDOW_HEIGHT))
-            for bg in BACKGROUNDS_CONFIG 
-            if bg['sprite'] is not None 
-        }
+        # Backgrounds are opaque, so they drop any alpha channel when converted.
+        # Menus only need small thumbnails; full-size backgrounds are loaded on
+        # demand and evicted once they exceed BACKGROUND_CACHE_BUDGET
+        convert_opaque = lambda surface: convert_for_display(surface, alpha=False)
+        self.background_thumbnails = LazyAssets(self.asset_loader, [bg['name'] for bg in image_backgrounds], convert_opaque)
+        self.backgrounds = AssetCache(
+            {bg['name']: (bg['sprite'], (WINDOW_WIDTH, WINDOW_HEIGHT)) for bg in image_backgrounds},
+            self._load_sprite,
+            BACKGROUND_CACHE_BUDGET,
+            self.asset_loader,
+            convert_opaque
+        )
+        self.backgrounds.prefetch(self.game_state.selected_background)
         
         # Generate difficulty data
         self.speeds = {diff['name']: diff['speed'] for diff in DIFFICULTY_CONFIG}
         self.difficulty_colors = {diff['name']: diff['color'] for diff in DIFFICULTY_CONFIG}
     
     def _load_sprite(self, filename, size=(SQUARE_SIZE, SQUARE_SIZE)):
-        """Load and scale a sprite with error handling"""
+        """Load and scale a sprite with error handling, from the asset pack when it's current"""
+        sprite = self.asset_pack.get(filename, size) if self.asset_pack else None
+        if sprite is not None:
+            return sprite
+        
         try:
-            sprite = pygame.image.load(f"assets/{filename}")
+            sprite = pygame.image.load(os.path.join(ASSETS_DIR, filename))
             return pygame.transform.scale(sprite, size)
         except (pygame.error, FileNotFoundError) as e:
             print(f"Warning: Could not load sprite '{filename}': {e}")
@@ -80,9 +152,9 @@ class Game:
         options = [GAME_NAMES['start_game'], GAME_NAMES['high_scores'], GAME_NAMES['settings'], GAME_NAMES['exit']]
         selected = 0
         
-        while True:
-            self._draw_main_menu_screen(options, selected)
-            action = self._handle_main_menu_input(selected, len(options))
+        def handle_event(event):
+            nonlocal selected
+            action = self._handle_main_menu_input(event, selected, len(options))
             
             if action == 'exit':
                 safe_exit()
@@ -90,21 +162,26 @@ class Game:
                 return 'game'
             elif action == 'high_scores':
                 self.show_high_scores()
+                return REDRAW
             elif action == 'settings':
                 return 'settings'
-            elif isinstance(action, int):
+            elif isinstance(action, int) and action != selected:
                 selected = action
+                return REDRAW
+            return None
+        
+        return run_menu(lambda: self._draw_main_menu_screen(options, selected), handle_event)
     
     def _draw_main_menu_screen(self, options, selected):
         """Draw the main menu screen"""
         self.screen.fill(BLACK)
         
         # Main title
-        title = self.large_font.render(GAME_NAMES['game_title'], True, CYAN)
+        title = render_text(self.large_font, GAME_NAMES['game_title'], True, CYAN)
         title_rect = title.get_rect(center=(WINDOW_WIDTH//2, MAIN_TITLE_Y_OFFSET))
         self.screen.blit(title, title_rect)
         
-        subtitle = self.font.render(GAME_NAMES['game_subtitle'], True, NEON_GREEN)
+        subtitle = render_text(self.font, GAME_NAMES['game_subtitle'], True, NEON_GREEN)
         subtitle_rect = subtitle.get_rect(center=(WINDOW_WIDTH//2, SUBTITLE_Y_OFFSET))
         self.screen.blit(subtitle, subtitle_rect)
         
@@ -115,22 +192,19 @@ class Game:
         self._draw_main_menu_options(options, selected)
         
         # Instructions
-        instructions = self.small_font.render(GAME_NAMES['navigation_help'], True, GRAY)
+        instructions = render_text(self.small_font, GAME_NAMES['navigation_help'], True, GRAY)
         instructions_rect = instructions.get_rect(center=(WINDOW_WIDTH//2, INFO_TEXT_Y_BOTTOM))
         self.screen.blit(instructions, instructions_rect)
-        
-        pygame.display.flip()
-        self.clock.tick(TARGET_FPS)
     
     def _draw_character_info(self):
         """Draw character selection info in top-left corner"""
-        character_text = self.small_font.render(f'{GAME_NAMES["character_info"]}: {self.game_state.selected_character}', True, WHITE)
+        character_text = render_text(self.small_font, f'{GAME_NAMES["character_info"]}: {self.game_state.selected_character}', True, WHITE)
         self.screen.blit(character_text, (CHARACTER_INFO_START_X, CHARACTER_INFO_START_Y))
         
-        background_text = self.small_font.render(f'{GAME_NAMES["background_info"]}: {self.game_state.selected_background}', True, WHITE)
+        background_text = render_text(self.small_font, f'{GAME_NAMES["background_info"]}: {self.game_state.selected_background}', True, WHITE)
         self.screen.blit(background_text, (CHARACTER_INFO_START_X, CHARACTER_INFO_START_Y + CHARACTER_INFO_LINE_HEIGHT))
         
-        garbage_text = self.small_font.render(f'{GAME_NAMES["garbage_bag_info"]}: {self.game_state.selected_garbage}', True, WHITE)
+        garbage_text = render_text(self.small_font, f'{GAME_NAMES["garbage_bag_info"]}: {self.game_state.selected_garbage}', True, WHITE)
         self.screen.blit(garbage_text, (CHARACTER_INFO_START_X, CHARACTER_INFO_START_Y + CHARACTER_INFO_LINE_HEIGHT * 2))
     
     def _draw_main_menu_options(self, options, selected):
@@ -147,31 +221,28 @@ class Game:
             
             # Render menu text
             color = WHITE if is_selected else LIGHT_GRAY
-            text = self.font.render(option, True, color)
+            text = render_text(self.font, option, True, color)
             text_rect = text.get_rect(center=(WINDOW_WIDTH//2, y))
             self.screen.blit(text, text_rect)
     
-    def _handle_main_menu_input(self, selected, options_count):
-        """Handle main menu input and return action"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+    def _handle_main_menu_input(self, event, selected, options_count):
+        """Handle a main menu input event and return action"""
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
                 return 'exit'
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+            elif event.key == pygame.K_UP:
+                return (selected - 1) % options_count
+            elif event.key == pygame.K_DOWN:
+                return (selected + 1) % options_count
+            elif event.key == pygame.K_RETURN:
+                if selected == 0:  # Start Game
+                    return 'game'
+                elif selected == 1:  # High Scores
+                    return 'high_scores'
+                elif selected == 2:  # Settings
+                    return 'settings'
+                elif selected == 3:  # Exit
                     return 'exit'
-                elif event.key == pygame.K_UP:
-                    return (selected - 1) % options_count
-                elif event.key == pygame.K_DOWN:
-                    return (selected + 1) % options_count
-                elif event.key == pygame.K_RETURN:
-                    if selected == 0:  # Start Game
-                        return 'game'
-                    elif selected == 1:  # High Scores
-                        return 'high_scores'
-                    elif selected == 2:  # Settings
-                        return 'settings'
-                    elif selected == 3:  # Exit
-                        return 'exit'
         return selected
     
     def settings_menu(self):
@@ -179,26 +250,31 @@ class Game:
         options = [GAME_NAMES['select_character'], GAME_NAMES['select_background'], GAME_NAMES['select_garbage_bag']]
         selected = 0
         
-        while True:
-            self._draw_settings_screen(options, selected)
-            action = self._handle_settings_input(selected, len(options))
+        def handle_event(event):
+            nonlocal selected
+            action = self._handle_settings_input(event, selected, len(options))
             
             if action == 'exit':
-                return
+                return action
             elif action == 'character':
                 self.select_character()
             elif action == 'background':
                 self.select_background()
             elif action == 'garbage':
                 self.select_garbage_bag()
-            elif isinstance(action, int):
+            elif isinstance(action, int) and action != selected:
                 selected = action
+            else:
+                return None
+            return REDRAW
+        
+        run_menu(lambda: self._draw_settings_screen(options, selected), handle_event)
     
     def _draw_settings_screen(self, options, selected):
         """Draw settings menu screen"""
         self.screen.fill(BLACK)
         
-        title = self.large_font.render(GAME_NAMES['settings'].upper(), True, CYAN)
+        title = render_text(self.large_font, GAME_NAMES['settings'].upper(), True, CYAN)
         title_rect = title.get_rect(center=(WINDOW_WIDTH//2, TITLE_Y_OFFSET))
         self.screen.blit(title, title_rect)
         
@@ -217,37 +293,31 @@ class Game:
             
             # Render menu text
             color = WHITE if is_selected else LIGHT_GRAY
-            text = self.font.render(option, True, color)
+            text = render_text(self.font, option, True, color)
             text_rect = text.get_rect(center=(WINDOW_WIDTH//2, y))
             self.screen.blit(text, text_rect)
         
         # Back info
-        back_info = self.font.render(GAME_NAMES['back_instruction'], True, GRAY)
+        back_info = render_text(self.font, GAME_NAMES['back_instruction'], True, GRAY)
         back_rect = back_info.get_rect(center=(WINDOW_WIDTH//2, SETTINGS_BACK_Y))
         self.screen.blit(back_info, back_rect)
-        
-        pygame.display.flip()
-        self.clock.tick(TARGET_FPS)
     
-    def _handle_settings_input(self, selected, options_count):
-        """Handle settings menu input"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+    def _handle_settings_input(self, event, selected, options_count):
+        """Handle a settings menu input event"""
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
                 return 'exit'
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return 'exit'
-                elif event.key == pygame.K_UP:
-                    return (selected - 1) % options_count
-                elif event.key == pygame.K_DOWN:
-                    return (selected + 1) % options_count
-                elif event.key == pygame.K_RETURN:
-                    if selected == 0:  # Select Character
-                        return 'character'
-                    elif selected == 1:  # Select Background
-                        return 'background'
-                    elif selected == 2:  # Select Garbage Bag
-                        return 'garbage'
+            elif event.key == pygame.K_UP:
+                return (selected - 1) % options_count
+            elif event.key == pygame.K_DOWN:
+                return (selected + 1) % options_count
+            elif event.key == pygame.K_RETURN:
+                if selected == 0:  # Select Character
+                    return 'character'
+                elif selected == 1:  # Select Background
+                    return 'background'
+                elif selected == 2:  # Select Garbage Bag
+                    return 'garbage'
         return selected
     
     def select_character(self):
@@ -265,7 +335,7 @@ class Game:
             self.game_state.save_settings()
         
         generic_selection_menu(
-            self.screen, self.clock, self.font, self.large_font, self.small_font,
+            self.screen, self.font, self.large_font, self.small_font,
             GAME_NAMES['select_character'],
             character_names,
             self.game_state.selected_character,
@@ -284,13 +354,14 @@ class Game:
         def on_select(name):
             self.game_state.selected_background = name
             self.game_state.save_settings()
+            self.backgrounds.prefetch(name)
         
         generic_selection_menu(
-            self.screen, self.clock, self.font, self.large_font, self.small_font,
+            self.screen, self.font, self.large_font, self.small_font,
             GAME_NAMES['select_background'],
             options,
             self.game_state.selected_background,
-            backgrounds=self.backgrounds,
+            backgrounds=self.background_thumbnails,
             get_active_func=is_active,
             on_select_func=on_select,
             preview_type='background'
@@ -311,7 +382,7 @@ class Game:
             self.game_state.save_settings()
         
         generic_selection_menu(
-            self.screen, self.clock, self.font, self.large_font, self.small_font,
+            self.screen, self.font, self.large_font, self.small_font,
             GAME_NAMES['select_garbage_bag'],
             options,
             self.game_state.selected_garbage,
@@ -322,40 +393,33 @@ class Game:
     
     def show_high_scores(self):
         """Display high scores with error handling"""
-        import json
-        try:
-            with open('highscores.json', 'r') as f:
-                scores = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError, IOError, OSError):
-            scores = []
+        scores = self.score_store.top()
         
-        while True:
+        def draw():
             self.screen.fill(BLACK)
-            title = self.large_font.render(GAME_NAMES['high_scores'].upper(), True, CYAN)
+            title = render_text(self.large_font, GAME_NAMES['high_scores'].upper(), True, CYAN)
             title_rect = title.get_rect(center=(WINDOW_WIDTH//2, TITLE_Y_OFFSET))
             self.screen.blit(title, title_rect)
             
             if not scores:
-                message = self.font.render(GAME_NAMES['no_scores_yet'], True, WHITE)
+                message = render_text(self.font, GAME_NAMES['no_scores_yet'], True, WHITE)
                 message_rect = message.get_rect(center=(WINDOW_WIDTH//2, HIGH_SCORES_NO_SCORES_Y))
                 self.screen.blit(message, message_rect)
             else:
                 self._draw_high_scores_table(scores)
             
             # Back info
-            back_info = self.font.render(GAME_NAMES['back_instruction'], True, GRAY)
+            back_info = render_text(self.font, GAME_NAMES['back_instruction'], True, GRAY)
             back_rect = back_info.get_rect(center=(WINDOW_WIDTH//2, INFO_TEXT_Y_BOTTOM))
             self.screen.blit(back_info, back_rect)
-            
-            pygame.display.flip()
-            self.clock.tick(TARGET_FPS)
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    safe_exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
-                        return
+        
+        def handle_event(event):
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
+                    return 'back'
+            return None
+        
+        run_menu(draw, handle_event)
     
     def _draw_high_scores_table(self, scores):
         """Draw the high scores table"""
@@ -364,7 +428,7 @@ class Game:
         headers = [GAME_NAMES['rank'], GAME_NAMES['name'], GAME_NAMES['score'], GAME_NAMES['difficulty_header']]
         
         for header, x_pos in zip(headers, positions):
-            text = self.small_font.render(header, True, WHITE)
+            text = render_text(self.small_font, header, True, WHITE)
             self.screen.blit(text, (x_pos, y_pos))
         
         y_pos += HIGH_SCORES_HEADER_SPACING
@@ -381,13 +445,11 @@ class Game:
         
         texts = [f"{i+1}.", score_info['name'][:MAX_NAME_LENGTH], str(score_info['score']), score_info['difficulty']]
         for text, x_pos in zip(texts, positions):
-            text_surface = self.small_font.render(text, True, color)
+            text_surface = render_text(self.small_font, text, True, color)
             self.screen.blit(text_surface, (x_pos, y_pos))
     
     def run(self):
         """Main game loop"""
-        self.game_state.load_settings()
-        
         while True:
             menu_choice = self.main_menu()
             
@@ -398,7 +460,7 @@ class Game:
                 continue
             
             # Setup new game session
-            if not enter_name(self.screen, self.clock, self.font, self.large_font, self.small_font, self.game_state):
+            if not enter_name(self.screen, self.font, self.large_font, self.small_font, self.game_state):
                 continue
             
             # Difficulty selection
@@ -425,9 +487,9 @@ class Game:
         options = list(self.speeds.keys())
         selected = 0
         
-        while True:
+        def draw():
             self.screen.fill(BLACK)
-            title = self.font.render(GAME_NAMES['select_difficulty'], True, WHITE)
+            title = render_text(self.font, GAME_NAMES['select_difficulty'], True, WHITE)
             title_rect = title.get_rect(center=(WINDOW_WIDTH//2, NAME_INPUT_TITLE_Y))
             self.screen.blit(title, title_rect)
             
@@ -444,150 +506,163 @@ class Game:
                 else:
                     color = difficulty_color
                     
-                option = self.font.render(name, True, color)
+                option = render_text(self.font, name, True, color)
                 option_rect = option.get_rect(center=(WINDOW_WIDTH//2, y))
                 self.screen.blit(option, option_rect)
             
             # ESC exit info
-            exit_info = self.font.render(GAME_NAMES['exit_instruction'], True, GRAY)
+            exit_info = render_text(self.font, GAME_NAMES['exit_instruction'], True, GRAY)
             exit_rect = exit_info.get_rect(center=(WINDOW_WIDTH//2, GAME_OVER_EXIT_Y))
             self.screen.blit(exit_info, exit_rect)
-            
-            pygame.display.flip()
-            self.clock.tick(TARGET_FPS)
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    safe_exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_UP:
-                        selected = (selected - 1) % len(options)
-                    elif event.key == pygame.K_DOWN:
-                        selected = (selected + 1) % len(options)
-                    elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                        return self.speeds[options[selected]], options[selected]
-                    elif event.key == pygame.K_ESCAPE:
-                        return None, None  # Return to main menu
+        
+        def handle_event(event):
+            nonlocal selected
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    selected = (selected - 1) % len(options)
+                    return REDRAW
+                elif event.key == pygame.K_DOWN:
+                    selected = (selected + 1) % len(options)
+                    return REDRAW
+                elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
+                    return self.speeds[options[selected]], options[selected]
+                elif event.key == pygame.K_ESCAPE:
+                    return None, None  # Return to main menu
+            return None
+        
+        return run_menu(draw, handle_event)
     
     def run_game_session(self, game_speed, difficulty_name):
         """Run a complete game session"""
-        collector = TrashCollector(self.characters[self.game_state.selected_character])
-        trash = Trash(self.trash_sprites)
-        score = 0
-        last_dir = (1, 0)
-        frame_counter = 0
+        # A fresh seed per session; the recorder logs turns for the replay
+        recorder = ReplayRecorder()
+        engine = self.engine = GameEngine(self.characters[self.game_state.selected_character], self.trash_sprites, recorder=recorder)
+        tick_ms = 1000.0 / game_speed
+        accumulator = 0.0
         pending_direction = None
+        self.backgrounds.get(self.game_state.selected_background)  # Finish loading before the clock starts
+        self.clock.tick()  # Don't count time spent in the menus
+        self.renderer.invalidate()
+        profiler = self.profiler = FrameProfiler() if self.perf else None
+        self.renderer.profiler = profiler
+        if profiler:
+            engine.collector.check_collision = profiler.timed(engine.collector.check_collision, 'collision')
 
         while True:
+            if profiler:
+                profiler.frame()
+            
             # Handle input
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    # Queued before safe_exit, whose writer.close() hook writes it out
+                    self._save_perf(profiler, engine, difficulty_name)
                     safe_exit()
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.renderer.invalidate()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
+                        self._save_perf(profiler, engine, difficulty_name)
                         return 'main_menu'
+                    if event.key == pygame.K_F3 and profiler:
+                        self.perf_overlay = not self.perf_overlay
 
-                    new_dir = None
-                    if event.key == pygame.K_UP and last_dir != (0, 1):
-                        new_dir = (0, -1)
-                    elif event.key == pygame.K_DOWN and last_dir != (0, -1):
-                        new_dir = (0, 1)
-                    elif event.key == pygame.K_LEFT and last_dir != (1, 0):
-                        new_dir = (-1, 0)
-                    elif event.key == pygame.K_RIGHT and last_dir != (-1, 0):
-                        new_dir = (1, 0)
-
-                    if new_dir:
+                    new_dir = KEY_DIRECTIONS.get(event.key)
+                    if new_dir and engine.can_turn(new_dir):
                         pending_direction = new_dir
+            if profiler:
+                profiler.mark('input')
 
-            # Update game state
-            frame_counter += 1
-
-            if frame_counter >= (TARGET_FPS // game_speed):
-                frame_counter = 0
-                old_tail = collector.squares[-1]
-                if pending_direction:
-                    collector.dir_x, collector.dir_y = pending_direction
-                    last_dir = pending_direction
-                    pending_direction = None
-                collector.move()
+            # Update game state in fixed ticks, catching up after slow frames
+            steps = 0
+            while accumulator >= tick_ms and steps < MAX_CATCH_UP_STEPS:
+                accumulator -= tick_ms
+                steps += 1
+                engine.step(pending_direction)
+                pending_direction = None
 
-                # Check collision
-                if collector.check_collision():
-                    choice = self.game_over_screen(score, difficulty_name)
-                    return choice
-            
-            # Check trash collection
-            head_x, head_y = collector.squares[0]
-            distance_x = abs(head_x - trash.x)
-            distance_y = abs(head_y - trash.y)
-            collision = (distance_x <= TRASH_COLLECTION_TOLERANCE) and (distance_y <= TRASH_COLLECTION_TOLERANCE)
-            
-            if collision:
-                if frame_counter == 0:  # Just moved
-                    collector.squares.append(old_tail)
-                else:
-                    collector.squares.append(collector.squares[-1])
-                
-                score += 1
-                trash = Trash(self.trash_sprites)
+                if engine.game_over:
+                    self._save_replay(Replay.from_engine(engine, recorder, difficulty_name, self.game_state.player_name))
+                    self._save_perf(profiler, engine, difficulty_name)
+                    return self.game_over_screen(engine.score, difficulty_name, board_full=engine.board_full)
+            if accumulator >= tick_ms:
+                # Too far behind to catch up - drop the backlog rather than spiral
+                accumulator %= tick_ms
+            if profiler:
+                profiler.mark('update')
             
             # Render
-            self._render_game(collector, trash, score)
-            self.clock.tick(TARGET_FPS)
+            alpha = accumulator / tick_ms if RENDER_INTERPOLATION else 1.0
+            self._render_game(engine.collector, engine.trash, engine.score, alpha)
+            if profiler:
+                profiler.mark('render')
+            accumulator += self.clock.tick(TARGET_FPS)
     
-    def _render_game(self, collector, trash, score):
-        """Render the game screen"""
-        # Draw background
-        if self.game_state.selected_background in self.backgrounds:
-            self.screen.blit(self.backgrounds[self.game_state.selected_background], (0, 0))
-        else:
-            self.screen.fill(BLACK)
-            
-        collector.draw(self.screen, self.garbage_bags[self.game_state.selected_garbage])
-        trash.draw(self.screen)
-        
-        # Draw UI
+    def _render_game(self, collector, trash, score, alpha=1.0):
+        """Render the game screen, with sprites interpolated alpha of the way into the current tick"""
+        background = self.backgrounds.get(self.game_state.selected_background)
+        placements = collector.sprite_placements(self.garbage_bags[self.game_state.selected_garbage], alpha)
+        placements.append((trash.sprite, (trash.x, trash.y)))
+        
+        # The overlay text only changes every PERF_OVERLAY_REFRESH ms, so the HUD isn't redrawn every frame
+        hud_key = score
+        if self.perf_overlay and self.profiler:
+            now = pygame.time.get_ticks()
+            if now >= self.perf_text_due:
+                self.perf_text = self.profiler.overlay_text()
+                self.perf_text_due = now + PERF_OVERLAY_REFRESH
+            hud_key = (score, self.perf_text)
+        
+        # Only changed cells and a changed score are pushed to the display
+        self.renderer.render(background, placements, hud_key, lambda: self._draw_hud(score), alpha < 1.0)
+    
+    def _draw_hud(self, score):
+        """Draw the UI strip with the player's score"""
         pygame.draw.rect(self.screen, DARK_GRAY, (0, 0, WINDOW_WIDTH, UI_AREA_HEIGHT))
         pygame.draw.rect(self.screen, LIGHT_GRAY, (0, UI_AREA_HEIGHT - UI_BORDER_HEIGHT, WINDOW_WIDTH, UI_BORDER_HEIGHT))
         
         # Player info - vertically centered in UI area
-        player_text = self.small_font.render(f"{self.game_state.player_name}: {score} {GAME_NAMES['trash_collected']}", True, LIGHT_GRAY)
+        player_text = render_text(self.small_font, f"{self.game_state.player_name}: {score} {GAME_NAMES['trash_collected']}", True, LIGHT_GRAY)
         text_height = player_text.get_height()
         text_y = (UI_AREA_HEIGHT - text_height) // 2
         self.screen.blit(player_text, (UI_PADDING, text_y))
         
-        # ESC info - vertically centered in UI area
-        esc_text = self.small_font.render(GAME_NAMES['main_menu_instruction'], True, LIGHT_GRAY)
+        # ESC info (or the frame profiler overlay) - vertically centered in UI area
+        if self.perf_overlay and self.profiler:
+            esc_text = render_text(self.small_font, self.perf_text, True, YELLOW)
+        else:
+            esc_text = render_text(self.small_font, GAME_NAMES['main_menu_instruction'], True, LIGHT_GRAY)
         esc_width = esc_text.get_width()
         self.screen.blit(esc_text, (WINDOW_WIDTH - esc_width - UI_PADDING, text_y))
-        
-        pygame.display.flip()
     
-    def game_over_screen(self, score, difficulty_name):
+    def game_over_screen(self, score, difficulty_name, board_full=False):
         """Simplified game over screen"""
+        self.save_error = None
         self._save_score(score, difficulty_name)
         
-        while True:
+        def draw():
             self.screen.fill(BLACK)
             
-            title = self.large_font.render(GAME_NAMES['game_over'].upper(), True, RED)
+            if board_full:
+                title = render_text(self.large_font, GAME_NAMES['board_cleared'].upper(), True, GREEN)
+            else:
+                title = render_text(self.large_font, GAME_NAMES['game_over'].upper(), True, RED)
             title_rect = title.get_rect(center=(WINDOW_WIDTH//2, GAME_OVER_TITLE_Y))
             self.screen.blit(title, title_rect)
             
             # Game result info
-            player_text = self.font.render(f'{GAME_NAMES["player"]}: {self.game_state.player_name}', True, PURPLE)
+            player_text = render_text(self.font, f'{GAME_NAMES["player"]}: {self.game_state.player_name}', True, PURPLE)
             player_rect = player_text.get_rect(center=(WINDOW_WIDTH//2, GAME_OVER_PLAYER_Y))
             self.screen.blit(player_text, player_rect)
             
-            score_text = self.font.render(f'{GAME_NAMES["collected_trash"]}: {score}', True, NEON_GREEN)
+            score_text = render_text(self.font, f'{GAME_NAMES["collected_trash"]}: {score}', True, NEON_GREEN)
             score_rect = score_text.get_rect(center=(WINDOW_WIDTH//2, GAME_OVER_SCORE_Y))
             self.screen.blit(score_text, score_rect)
             
             # Difficulty info
             difficulty_color = self.difficulty_colors.get(difficulty_name, LIGHT_GRAY)
-            difficulty_label = self.font.render(f'{GAME_NAMES["difficulty"]}: ', True, WHITE)
-            difficulty_level = self.font.render(difficulty_name, True, difficulty_color)
+            difficulty_label = render_text(self.font, f'{GAME_NAMES["difficulty"]}: ', True, WHITE)
+            difficulty_level = render_text(self.font, difficulty_name, True, difficulty_color)
             
             total_width = difficulty_label.get_width() + difficulty_level.get_width()
             start_x = (WINDOW_WIDTH - total_width) // 2
@@ -602,33 +677,39 @@ class Game:
             difficulty_level_rect.centery = GAME_OVER_DIFFICULTY_Y
             self.screen.blit(difficulty_level, difficulty_level_rect)
             
-            environmental_msg = self.font.render(GAME_NAMES['environmental_message'], True, NEON_GREEN)
+            environmental_msg = render_text(self.font, GAME_NAMES['environmental_message'], True, NEON_GREEN)
             environmental_rect = environmental_msg.get_rect(center=(WINDOW_WIDTH//2, GAME_OVER_MESSAGE_Y))
             self.screen.blit(environmental_msg, environmental_rect)
             
+            # Shown once the background writer reports a failed save
+            if self.save_error:
+                message = 'score_rejected' if isinstance(self.save_error, ScoreRejected) else 'save_failed'
+                error_text = render_text(self.small_font, GAME_NAMES[message], True, RED)
+                error_rect = error_text.get_rect(center=(WINDOW_WIDTH//2, GAME_OVER_SAVE_ERROR_Y))
+                self.screen.blit(error_text, error_rect)
+            
             # Draw options with highlighting
             self._draw_game_over_options()
-            
-            pygame.display.flip()
-            self.clock.tick(TARGET_FPS)
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    safe_exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        return 'play_again'  # Play again
-                    elif event.key == pygame.K_s:
-                        self.show_high_scores()
-                    elif event.key == pygame.K_ESCAPE:
-                        return 'main_menu'  # Go to main menu
+        
+        def handle_event(event):
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    return 'play_again'  # Play again
+                elif event.key == pygame.K_s:
+                    self.show_high_scores()
+                    return REDRAW
+                elif event.key == pygame.K_ESCAPE:
+                    return 'main_menu'  # Go to main menu
+            return None
+        
+        return run_menu(draw, handle_event)
     
     def _draw_game_over_options(self):
         """Draw game over screen options"""
         # ENTER option
-        enter_prefix = self.font.render('Press ', True, WHITE)
-        enter_key = self.font.render('ENTER', True, NEON_GREEN)
-        enter_suffix = self.font.render(' to play again', True, WHITE)
+        enter_prefix = render_text(self.font, 'Press ', True, WHITE)
+        enter_key = render_text(self.font, 'ENTER', True, NEON_GREEN)
+        enter_suffix = render_text(self.font, ' to play again', True, WHITE)
         
         total_enter_width = enter_prefix.get_width() + enter_key.get_width() + enter_suffix.get_width()
         enter_start_x = (WINDOW_WIDTH - total_enter_width) // 2
@@ -639,9 +720,9 @@ class Game:
         self.screen.blit(enter_suffix, (enter_start_x + enter_prefix.get_width() + enter_key.get_width(), enter_y))
         
         # S option
-        s_prefix = self.font.render('Press ', True, WHITE)
-        s_key = self.font.render('S', True, YELLOW)
-        s_suffix = self.font.render(' to show scores', True, WHITE)
+        s_prefix = render_text(self.font, 'Press ', True, WHITE)
+        s_key = render_text(self.font, 'S', True, YELLOW)
+        s_suffix = render_text(self.font, ' to show scores', True, WHITE)
         
         total_s_width = s_prefix.get_width() + s_key.get_width() + s_suffix.get_width()
         s_start_x = (WINDOW_WIDTH - total_s_width) // 2
@@ -652,9 +733,9 @@ class Game:
         self.screen.blit(s_suffix, (s_start_x + s_prefix.get_width() + s_key.get_width(), s_y))
         
         # ESC option
-        esc_prefix = self.font.render('Press ', True, WHITE)
-        esc_key = self.font.render('ESC', True, RED)
-        esc_suffix = self.font.render(' for main menu', True, WHITE)
+        esc_prefix = render_text(self.font, 'Press ', True, WHITE)
+        esc_key = render_text(self.font, 'ESC', True, RED)
+        esc_suffix = render_text(self.font, ' for main menu', True, WHITE)
         
         total_esc_width = esc_prefix.get_width() + esc_key.get_width() + esc_suffix.get_width()
         esc_start_x = (WINDOW_WIDTH - total_esc_width) // 2
@@ -665,48 +746,100 @@ class Game:
         self.screen.blit(esc_suffix, (esc_start_x + esc_prefix.get_width() + esc_key.get_width(), esc_y))
     
     def _save_score(self, score, difficulty):
-        """Save player score with comprehensive error handling"""
-        import json
-        try:
-            with open('highscores.json', 'r') as f:
-                scores = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError, IOError, OSError):
-            scores = []
-        
-        # Check if player with same name exists
-        existing_player_index = -1
-        for i, player in enumerate(scores):
-            if player['name'] == self.game_state.player_name:
-                existing_player_index = i
-                break
-        
-        new_score = {
-            'name': self.game_state.player_name,
-            'score': score,
-            'difficulty': difficulty
-        }
-        
-        if existing_player_index != -1:
-            # If player exists, only update if score is better
-            if score > scores[existing_player_index]['score']:
-                scores[existing_player_index] = new_score
-        else:
-            # Add new player
-            scores.append(new_score)
-        
-        scores.sort(key=lambda x: x['score'], reverse=True)
-        scores = scores[:MAX_HIGH_SCORES]
-        
-        try:
-            with open('highscores.json', 'w') as f:
-                json.dump(scores, f, indent=2)
-        except (IOError, OSError) as e:
-            print(f"Warning: Could not save high scores: {e}")
+        """Queue the player's score for saving; only a player's best result is kept"""
+        self.score_count += 1
+        self.writer.submit(('score', self.score_count), self._submit_verified_score,
+                           self.last_replay, self.game_state.player_name, score, difficulty)
+    
+    def _submit_verified_score(self, replay, name, score, difficulty):
+        """Writer job: re-simulate the session's replay and only record a score it reproduces"""
+        accepted, reason = verify_replay(replay, score) if replay else (False, 'no replay recorded')
+        if not accepted:
+            raise ScoreRejected(f"Score rejected: {reason}")
+        self.score_store.submit(name, score, difficulty)
+    
+    def _save_replay(self, replay):
+        """Queue a finished session's replay for writing to REPLAY_DIR"""
+        self.last_replay = replay
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.seed:016x}.replay"
+        self.writer.submit(('replay', replay.seed), replay.save, os.path.join(REPLAY_DIR, filename))
+    
+    def _save_perf(self, profiler, engine, difficulty_name):
+        """Queue a session's frame timings for writing to PERF_DIR"""
+        if not profiler:
+            return
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{engine.seed:016x}"
+        self.writer.submit(('perf', engine.seed), profiler.dump, os.path.join(PERF_DIR, name),
+                           {'difficulty': difficulty_name, 'score': engine.score, 'ticks': engine.ticks, 'seed': engine.seed})
+    
+    def _on_write_error(self, key, error):
+        """Called on the writer thread: remember a failed or rejected score for the game over screen.
+
+        The writer already logs every failure; settings, replay and perf
+        writes aren't the player's score, so they don't show the notice.
+        Only the latest session's score counts - an older one failing late
+        mustn't appear on the current game over screen.
+        """
+        if key != ('score', self.score_count):
+            return
+        self.save_error = error
+        pygame.event.post(pygame.event.Event(STATUS_CHANGED))
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    from bots import POLICIES
+    parser = argparse.ArgumentParser(description="EcoSnake Game")
+    parser.add_argument('--headless', action='store_true',
+                        help="run bot games without a window and print a JSON report")
+    parser.add_argument('--games', type=int, default=100, help="number of headless games")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy', help="bot policy")
+    parser.add_argument('--difficulty', choices=[diff['name'] for diff in DIFFICULTY_CONFIG],
+                        default=DIFFICULTY_CONFIG[0]['name'], help="difficulty level")
+    parser.add_argument('--seed', type=int, default=0, help="first seed; games use seed..seed+games-1")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--max-ticks', type=int, default=HEADLESS_MAX_TICKS, help="tick limit per game")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    parser.add_argument('--perf', action='store_true',
+                        help="time each frame's phases (F3 shows them); also enabled by ECOSNAKE_PERF=1")
+    parser.add_argument('--profile', metavar='MODES',
+                        help="profile with cpu (cProfile), memory (tracemalloc) or both, e.g. cpu,memory; "
+                             "also enabled by ECOSNAKE_PROFILE")
+    parser.add_argument('--profile-scope', choices=['session', 'run'],
+                        help="profile each game session (default) or the whole run; also ECOSNAKE_PROFILE_SCOPE")
+    return parser.parse_args(argv)
+
+
+def run_headless(args):
+    """Run a headless bot tournament and report the results as JSON"""
+    from tournament import run_tournament
+    speed = next(diff['speed'] for diff in DIFFICULTY_CONFIG if diff['name'] == args.difficulty)
+    report = run_tournament(args.policy, args.difficulty, speed,
+                            range(args.seed, args.seed + args.games),
+                            workers=args.workers, max_ticks=args.max_ticks)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
 
 
 def main():
     """Main entry point - creates and runs the game"""
-    game = Game()
+    args = parse_args()
+    if args.headless:
+        run_headless(args)
+        return
+    # Only the windowed game changes directory, so headless --output stays relative to the caller
+    os.chdir(GAME_DIR)
+    game = Game(perf=args.perf or os.environ.get('ECOSNAKE_PERF') == '1')
+    profile = args.profile or os.environ.get('ECOSNAKE_PROFILE')
+    if profile:
+        from profiling import install_profiling
+        try:
+            install_profiling(game, profile, args.profile_scope or os.environ.get('ECOSNAKE_PROFILE_SCOPE', 'session'))
+        except ValueError as e:
+            print(f"Warning: Profiling disabled: {e}")
     game.run()
 
 
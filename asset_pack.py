@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Asset Pack
+Pre-scaled raw RGBA/RGBX sprites in one file, memory-mapped at startup instead of decoding PNGs
+
+Build (or rebuild after changing assets/ or SQUARE_SIZE) with:
+    python asset_pack.py
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import pygame
+from constants import *
+
+
+PACK_MAGIC = b'ECOPACK1'
+# Magic, index length; the JSON index follows, then the pixel data
+PACK_HEADER = struct.Struct('<8sI')
+PACK_ALIGNMENT = 16
+
+
+def _entry_key(filename, size):
+    return f'{filename}@{size[0]}x{size[1]}'
+
+
+def _source_stat(filename):
+    stat = os.stat(os.path.join(ASSETS_DIR, filename))
+    return stat.st_size, stat.st_mtime_ns
+
+
+def pack_layout():
+    """Describe the pack this build of the game expects"""
+    return {'square_size': SQUARE_SIZE, 'window': [WINDOW_WIDTH, WINDOW_HEIGHT]}
+
+
+def pack_targets():
+    """Every (filename, size) the game loads through Game._load_sprite"""
+    square = (SQUARE_SIZE, SQUARE_SIZE)
+    targets = [(item['sprite'], square) for item in CHARACTERS_CONFIG + TRASH_ITEMS_CONFIG + GARBAGE_BAGS_CONFIG]
+    for bg in BACKGROUNDS_CONFIG:
+        if bg['sprite'] is not None:
+            targets.append((bg['sprite'], (WINDOW_WIDTH, WINDOW_HEIGHT)))
+            targets.append((bg['sprite'], (LARGE_SPRITE_SIZE, LARGE_SPRITE_SIZE)))
+    return targets
+
+
+def build_pack(path=ASSET_PACK_FILE):
+    """Decode and scale every target once and write the pack atomically"""
+    entries = {}
+    blobs = []
+    offset = 0
+    for filename, size in pack_targets():
+        try:
+            sprite = pygame.transform.scale(pygame.image.load(os.path.join(ASSETS_DIR, filename)), size)
+            source_size, source_mtime = _source_stat(filename)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Warning: Skipping '{filename}' in asset pack: {e}")
+            continue
+        # Opaque sources stay opaque so they convert exactly like the PNG would
+        pixel_format = 'RGBA' if sprite.get_flags() & pygame.SRCALPHA else 'RGBX'
+        pixels = pygame.image.tobytes(sprite, pixel_format)
+        padding = -len(pixels) % PACK_ALIGNMENT
+        entries[_entry_key(filename, size)] = {
+            'offset': offset,
+            'width': size[0],
+            'height': size[1],
+            'format': pixel_format,
+            'source_size': source_size,
+            'source_mtime': source_mtime,
+        }
+        blobs.append(pixels + bytes(padding))
+        offset += len(pixels) + padding
+
+    index = dict(pack_layout(), entries=entries)
+    index_bytes = json.dumps(index).encode('utf-8')
+    index_bytes += b' ' * (-(PACK_HEADER.size + len(index_bytes)) % PACK_ALIGNMENT)
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temp_path, path)
+    return len(entries), os.path.getsize(path)
+
+
+class AssetPack:
+    """Read-only view of a built asset pack.
+
+    get() hands out surfaces that share memory with the mapped file, so
+    nothing is decoded or scaled. Entries whose source PNG changed since
+    the build are reported as missing and the caller falls back to PNG.
+    """
+
+    def __init__(self, path=ASSET_PACK_FILE):
+        with open(path, 'rb') as f:
+            # Private copy-on-write mapping: pages are shared until written
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, index_length = PACK_HEADER.unpack_from(self._map)
+        if magic != PACK_MAGIC:
+            raise ValueError('not an EcoSnake asset pack')
+        start = PACK_HEADER.size
+        self.index = json.loads(self._map[start:start + index_length])
+        self._data_start = start + index_length
+        self._view = memoryview(self._map)
+
+    @classmethod
+    def open(cls, path=ASSET_PACK_FILE):
+        """Open the pack if it exists and matches this build, else None"""
+        if not os.path.exists(path):
+            return None
+        try:
+            pack = cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Warning: Asset pack unreadable ({e}), loading PNGs")
+            return None
+        layout = pack_layout()
+        if any(pack.index.get(key) != value for key, value in layout.items()):
+            print("Info: Asset pack was built for another layout, loading PNGs")
+            return None
+        return pack
+
+    def get(self, filename, size):
+        """Surface for a pre-scaled sprite, or None when missing or stale"""
+        entry = self.index['entries'].get(_entry_key(filename, size))
+        if entry is None:
+            return None
+        try:
+            if _source_stat(filename) != (entry['source_size'], entry['source_mtime']):
+                return None
+        except OSError:
+            pass  # Source removed after the build; the packed copy is still good
+        start = self._data_start + entry['offset']
+        length = entry['width'] * entry['height'] * 4
+        return pygame.image.frombuffer(self._view[start:start + length], (entry['width'], entry['height']), entry['format'])
+
+
+if __name__ == '__main__':
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    count, total = build_pack(sys.argv[1] if len(sys.argv) > 1 else ASSET_PACK_FILE)
+    print(f"Packed {count} sprites ({total / 1024:.0f} KiB)")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Asset Loading
+Background decoding of image assets and a memory-bounded cache for large ones
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from constants import ASSET_LOADER_WORKERS, BACKGROUND_CACHE_BUDGET
+
+
+def surface_bytes(surface):
+    """Approximate pixel memory held by a surface"""
+    return surface.get_pitch() * surface.get_height()
+
+
+class AssetLoader:
+    """Runs asset load functions on a thread pool, keyed by asset name.
+
+    pygame releases the GIL while decoding and scaling, so PNGs load in
+    parallel while the main thread carries on (e.g. drawing the menu).
+    """
+
+    def __init__(self, workers=ASSET_LOADER_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asset-loader')
+        self.futures = {}
+
+    def submit(self, key, load_func, *args):
+        """Start loading an asset; jobs run roughly in submission order"""
+        self.futures[key] = self.executor.submit(load_func, *args)
+
+    def result(self, key):
+        """Wait for an asset and return it"""
+        return self.futures[key].result()
+
+    def done(self, key):
+        """Whether an asset has finished loading"""
+        return self.futures[key].done()
+
+    def pending(self, key):
+        """Whether a load job was submitted and not yet taken"""
+        return key in self.futures
+
+    def take(self, key):
+        """Remove and return the future for a key (None if never submitted)"""
+        return self.futures.pop(key, None)
+
+    def shutdown(self):
+        """Stop accepting work; jobs already running are left to finish"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LazyAssets:
+    """Read-only mapping over assets that may still be loading.
+
+    The first lookup of a name waits for its load job and passes the
+    result through prepare_func (e.g. display conversion), on the calling
+    thread, before caching it.
+    """
+
+    def __init__(self, loader, keys, prepare_func=None):
+        self.loader = loader
+        self._keys = list(keys)
+        self._prepare = prepare_func
+        self._ready = {}
+
+    def __contains__(self, name):
+        return name in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __getitem__(self, name):
+        if name not in self._ready:
+            if name not in self._keys:
+                raise KeyError(name)
+            asset = self.loader.result(name)
+            self._ready[name] = self._prepare(asset) if self._prepare else asset
+        return self._ready[name]
+
+    def get(self, name, default=None):
+        return self[name] if name in self._keys else default
+
+    def keys(self):
+        return list(self._keys)
+
+
+class AssetCache:
+    """Loads large assets on demand and keeps them within a byte budget.
+
+    sources maps each name to the arguments for load_func. The least
+    recently used entries are evicted once resident_bytes exceeds the
+    budget; the asset just requested always stays. prefetch() starts a
+    load on the AssetLoader so a later lookup doesn't stall.
+    """
+
+    def __init__(self, sources, load_func, budget_bytes=BACKGROUND_CACHE_BUDGET, loader=None, prepare_func=None):
+        self.sources = dict(sources)
+        self.load_func = load_func
+        self.budget_bytes = budget_bytes
+        self.loader = loader
+        self._prepare = prepare_func
+        self.entries = OrderedDict()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, name):
+        return name in self.sources
+
+    def __iter__(self):
+        return iter(self.sources)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __getitem__(self, name):
+        asset = self.entries.get(name)
+        if asset is not None:
+            self.entries.move_to_end(name)
+            self.hits += 1
+            return asset
+        
+        self.misses += 1
+        future = self.loader.take(self._loader_key(name)) if self.loader else None
+        asset = future.result() if future else self.load_func(*self.sources[name])
+        if self._prepare:
+            asset = self._prepare(asset)
+        self.entries[name] = asset
+        self.resident_bytes += surface_bytes(asset)
+        self._evict()
+        return asset
+
+    def get(self, name, default=None):
+        return self[name] if name in self.sources else default
+
+    def keys(self):
+        return list(self.sources)
+
+    def prefetch(self, name):
+        """Start loading an asset in the background if it isn't resident or pending"""
+        key = self._loader_key(name)
+        if self.loader and name in self.sources and name not in self.entries and not self.loader.pending(key):
+            self.loader.submit(key, self.load_func, *self.sources[name])
+
+    def _loader_key(self, name):
+        # Keeps prefetch jobs apart from other assets on a shared loader
+        return (id(self), name)
+
+    def _evict(self):
+        while self.resident_bytes > self.budget_bytes and len(self.entries) > 1:
+            _, asset = self.entries.popitem(last=False)
+            self.resident_bytes -= surface_bytes(asset)
+            self.evictions += 1
+
+    def stats(self):
+        """Hit/miss/eviction counters and resident memory"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'resident': list(self.entries),
+            'resident_bytes': self.resident_bytes,
+            'budget_bytes': self.budget_bytes,
+        }
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Vectorized Batch Simulator
+Steps many headless games in lockstep with NumPy (bot evaluation, load tests)
+
+NumPy is an optional dependency: the game itself only needs pygame, so
+install it separately to use this module (pip install numpy).
+"""
+
+import numpy as np
+from constants import (GRID_COLS, GRID_ROWS, GRID_TOP_ROW, TRASH_SPAWN_MARGIN_X,
+                       TRASH_SPAWN_MARGIN_Y, TRASH_SPAWN_EDGE_BUFFER)
+from engine import DIRECTIONS, RIGHT
+
+
+# Actions are indices into engine.DIRECTIONS; NO_ACTION keeps the current direction
+NO_ACTION = -1
+DIR_X = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+DIR_Y = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+OPPOSITE = np.array([DIRECTIONS.index((-dx, -dy)) for dx, dy in DIRECTIONS], dtype=np.int64)
+
+# Per-game outcomes returned by BatchEngine.step()
+OUTCOME_NONE = 0
+OUTCOME_COLLECTED = 1
+OUTCOME_COLLISION = 2
+OUTCOME_BOARD_FULL = 3
+
+
+class BatchEngine:
+    """N games held as NumPy arrays and advanced together.
+
+    Each game has a ring-buffer body of cell indices, a per-cell occupancy
+    grid and a trash cell, and follows the same rules as GameEngine.step().
+    Trash placement uses NumPy's generator, so individual games do not
+    reproduce GameEngine's random sequence.
+    """
+
+    def __init__(self, n_games, cols=GRID_COLS, rows=GRID_ROWS, seed=None):
+        self.n_games = n_games
+        self.cols = cols
+        self.rows = rows
+        self.capacity = cols * rows
+        self.rng = np.random.default_rng(seed)
+
+        region = np.zeros((rows, cols), dtype=bool)
+        region[TRASH_SPAWN_MARGIN_Y:rows - TRASH_SPAWN_EDGE_BUFFER + 1,
+               TRASH_SPAWN_MARGIN_X:cols - TRASH_SPAWN_EDGE_BUFFER + 1] = True
+        self.spawn_region = region.ravel()
+
+        self.bodies = np.zeros((n_games, self.capacity), dtype=np.int32)
+        self.occupancy = np.zeros((n_games, self.capacity), dtype=np.uint8)
+        self.head = np.zeros(n_games, dtype=np.int64)
+        self.length = np.zeros(n_games, dtype=np.int64)
+        self.direction = np.zeros(n_games, dtype=np.int64)
+        self.trash = np.zeros(n_games, dtype=np.int64)
+        self.score = np.zeros(n_games, dtype=np.int64)
+        self.ticks = np.zeros(n_games, dtype=np.int64)
+        self.alive = np.zeros(n_games, dtype=bool)
+        self.board_full = np.zeros(n_games, dtype=bool)
+        self.reset()
+
+    def reset(self, games=None):
+        """Restart the given games (all by default) from the initial state"""
+        games = np.arange(self.n_games) if games is None else np.asarray(games)
+        start = (self.rows // 2) * self.cols + self.cols // 2
+        self.occupancy[games] = 0
+        self.bodies[games, 0] = start
+        self.occupancy[games, start] = 1
+        self.head[games] = 0
+        self.length[games] = 1
+        self.direction[games] = DIRECTIONS.index(RIGHT)
+        self.score[games] = 0
+        self.ticks[games] = 0
+        self.alive[games] = True
+        self.board_full[games] = False
+        self._spawn_trash(games)
+
+    def _spawn_trash(self, games):
+        """Place trash uniformly on a free spawn cell; games without one are won"""
+        if not len(games):
+            return
+        free = (self.occupancy[games] == 0) & self.spawn_region
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        self.trash[games] = keys.argmax(axis=1)
+        full = games[~free.any(axis=1)]
+        self.alive[full] = False
+        self.board_full[full] = True
+
+    def step(self, actions=None):
+        """Advance every live game by one tick.
+
+        actions is an int array of direction indices (NO_ACTION to keep
+        going). Returns an array of OUTCOME_* codes, one per game.
+        """
+        outcomes = np.zeros(self.n_games, dtype=np.int8)
+        games = np.flatnonzero(self.alive)
+        if not len(games):
+            return outcomes
+        capacity, cols = self.capacity, self.cols
+
+        # Apply turns that don't reverse the current direction
+        direction = self.direction[games]
+        if actions is not None:
+            action = np.asarray(actions)[games]
+            turn = (action >= 0) & (action != OPPOSITE[direction])
+            direction = np.where(turn, action, direction)
+            self.direction[games] = direction
+
+        # Next head cell with wrap-around below the UI strip
+        head = self.head[games]
+        head_cell = self.bodies[games, head]
+        col = (head_cell % cols + DIR_X[direction]) % cols
+        row = head_cell // cols + DIR_Y[direction]
+        row = np.where(row < GRID_TOP_ROW, self.rows - 1, row)
+        row = np.where(row >= self.rows, GRID_TOP_ROW, row)
+        new_cell = row * cols + col
+
+        # Drop the tail, then push the new head
+        length = self.length[games]
+        tail = self.bodies[games, (head + length - 1) % capacity]
+        self.occupancy[games, tail] -= 1
+        head = (head - 1) % capacity
+        self.head[games] = head
+        self.bodies[games, head] = new_cell
+        self.occupancy[games, new_cell] += 1
+        self.ticks[games] += 1
+
+        # Self-collision: other segments on the head cell, skipping neck/shoulder
+        hits = self.occupancy[games, new_cell].astype(np.int64) - 1
+        hits -= self.bodies[games, (head + 1) % capacity] == new_cell
+        hits -= self.bodies[games, (head + 2) % capacity] == new_cell
+        collided = (length >= 4) & (hits > 0)
+        self.alive[games[collided]] = False
+        outcomes[games[collided]] = OUTCOME_COLLISION
+
+        # Trash collection grows the body back onto the vacated tail
+        collected = ~collided & (new_cell == self.trash[games])
+        grown = games[collected]
+        if len(grown):
+            grown_tail = tail[collected]
+            self.bodies[grown, (head[collected] + length[collected]) % capacity] = grown_tail
+            self.occupancy[grown, grown_tail] += 1
+            self.length[grown] += 1
+            self.score[grown] += 1
+            outcomes[grown] = OUTCOME_COLLECTED
+            self._spawn_trash(grown)
+            outcomes[grown[self.board_full[grown]]] = OUTCOME_BOARD_FULL
+        return outcomes
+
+    def body_cells(self, game):
+        """Body cell indices of one game, head first"""
+        index = (self.head[game] + np.arange(self.length[game])) % self.capacity
+        return self.bodies[game, index]
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Benchmarks
+Times the game's hot paths across snake lengths and board sizes and checks them against a baseline
+
+    python benchmark.py --save-baseline      # record this machine's numbers
+    python benchmark.py                      # compare; exits 1 on a regression
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+from constants import (BENCHMARK_BASELINE_FILE, BENCHMARK_REGRESSION_THRESHOLD, GRID_COLS, GRID_ROWS,
+                       GRID_TOP_ROW)
+from engine import GameEngine
+from game_objects import FreeCellIndex, Trash
+
+
+# Boards with an even number of playable rows, so cycle_path() is a closed loop
+BOARD_SIZES = [(GRID_COLS, GRID_ROWS), (50, 33), (100, 67)]
+BENCHMARKS = ('move', 'check_collision', 'spawn', 'collect', 'step', 'render')
+BATCH_SECONDS = 0.02
+REPEATS = 5
+COLLECT_CALLS = 256  # Pickups per timed batch; each one grows the snake
+
+
+def cycle_path(cols, rows):
+    """A loop through every playable cell: rows back and forth over columns 1.., back up column 0"""
+    path = []
+    for index, row in enumerate(range(GRID_TOP_ROW, rows)):
+        columns = range(1, cols) if index % 2 == 0 else range(cols - 1, 0, -1)
+        path.extend(row * cols + col for col in columns)
+    path.extend(row * cols for row in range(rows - 1, GRID_TOP_ROW - 1, -1))
+    return path
+
+
+def snake_lengths(cols, rows, quick=False):
+    """1, then powers of 4, up to a full board"""
+    full = cols * (rows - GRID_TOP_ROW)
+    lengths = [1]
+    while lengths[-1] * 4 < full:
+        lengths.append(lengths[-1] * 4)
+    lengths.append(full)
+    if quick:
+        lengths = lengths[:-1:2] + [full]
+    return lengths
+
+
+def make_engine(cols, rows, length, character_sprite=None, trash_sprites=None):
+    """An engine whose snake of the given length lies along cycle_path(), heading along it"""
+    path = cycle_path(cols, rows)
+    body = path[length - 1::-1]  # Head first
+    free_cells = FreeCellIndex(cols, rows)
+    for cell in body:
+        free_cells.remove(cell)
+
+    engine = GameEngine(character_sprite, trash_sprites, cols, rows, seed=0)
+    snapshot = engine.snapshot()
+    head, neck = body[0], body[1] if length > 1 else path[-1]
+    step = head - neck
+    snapshot.update(body=body, free_cells=list(free_cells.cells),
+                    direction={1: (1, 0), -1: (-1, 0), cols: (0, 1), -cols: (0, -1)}[step])
+    engine.restore(snapshot)
+    engine.path_actions = _path_actions(path, cols)
+    return engine
+
+
+def _path_actions(path, cols):
+    """Direction to take from each cell to stay on the path"""
+    directions = {1: (1, 0), -1: (-1, 0), cols: (0, 1), -cols: (0, -1)}
+    return {cell: directions[path[(i + 1) % len(path)] - cell] for i, cell in enumerate(path)}
+
+
+def time_call(func):
+    """Best per-call time in nanoseconds over REPEATS batches of about BATCH_SECONDS"""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= BATCH_SECONDS:
+            break
+        calls *= 2
+    best = elapsed
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e9
+
+
+def bench_move(cols, rows, length):
+    return time_call(make_engine(cols, rows, length).collector.move)
+
+
+def bench_check_collision(cols, rows, length):
+    return time_call(make_engine(cols, rows, length).collector.check_collision)
+
+
+def bench_spawn(cols, rows, length):
+    engine = make_engine(cols, rows, length)
+    if not engine.collector.free_cells:
+        return None  # Nothing left to spawn on
+    free_cells, rng = engine.collector.free_cells, random.Random(0)
+    return time_call(lambda: Trash(None, free_cells, rng))
+
+
+def bench_collect(cols, rows, length):
+    """A tick that picks up trash: move, collision check, grow, score and respawn from the free-cell index"""
+    # Stop while trash can still spawn, or the batch would end in a cleared board
+    calls = min(COLLECT_CALLS, len(make_engine(cols, rows, length).collector.free_cells) - 1)
+    if calls < 1:
+        return None  # No room left to grow
+    best = None
+    for _ in range(REPEATS):
+        # Growing changes the state, so every batch starts from a fresh engine
+        engine = make_engine(cols, rows, length)
+        actions, collector = engine.path_actions, engine.collector
+        start = time.perf_counter()
+        for _ in range(calls):
+            action = actions[collector.squares.head_cell]
+            engine.trash.cell = collector.next_cell(*action)
+            engine.step(action)
+        elapsed = time.perf_counter() - start
+        assert engine.score == calls and not engine.game_over
+        best = elapsed if best is None else min(best, elapsed)
+    return best / calls * 1e9
+
+
+def bench_step(cols, rows, length):
+    """Full tick (move, collision and trash-collection check) following the path, trash out of reach"""
+    engine = make_engine(cols, rows, length)
+    engine.trash.cell = -1
+    actions, body = engine.path_actions, engine.collector.squares
+    return time_call(lambda: engine.step(actions[body.head_cell]))
+
+
+class RenderBench:
+    """Game._render_game on the dummy SDL driver, redrawing a fresh interpolation step each call"""
+
+    def __init__(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        from EcoSnake import Game, GAME_DIR
+        os.chdir(GAME_DIR)  # The game loads its assets relative to its directory
+        # Keep the game's startup messages out of the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            self.game = Game()
+
+    def __call__(self, cols, rows, length):
+        if (cols, rows) != (GRID_COLS, GRID_ROWS):
+            return None  # The window only fits the default board
+        game = self.game
+        engine = make_engine(cols, rows, length, game.characters[game.game_state.selected_character], game.trash_sprites)
+        engine.collector.move()
+        collector, trash = engine.collector, engine.trash
+        game.renderer.invalidate()
+        alphas = [0.25, 0.5, 0.75, 1.0]
+        state = {'frame': 0}
+
+        def render():
+            state['frame'] += 1
+            game._render_game(collector, trash, 0, alphas[state['frame'] % 4])
+        return time_call(render)
+
+
+def run_benchmarks(names=BENCHMARKS, quick=False):
+    """Run the selected benchmarks; returns {case: ns per call}"""
+    functions = {
+        'move': bench_move,
+        'check_collision': bench_check_collision,
+        'spawn': bench_spawn,
+        'collect': bench_collect,
+        'step': bench_step,
+    }
+    if 'render' in names:
+        functions['render'] = RenderBench()
+
+    results = {}
+    for name in names:
+        for cols, rows in BOARD_SIZES[:1] if quick and name == 'render' else BOARD_SIZES:
+            for length in snake_lengths(cols, rows, quick):
+                ns = functions[name](cols, rows, length)
+                if ns is not None:
+                    results[f'{name}/{cols}x{rows}/{length}'] = round(ns, 1)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Cases more than threshold (a fraction) slower than the baseline"""
+    regressions = []
+    for case, ns in results.items():
+        base = baseline.get(case)
+        if base and ns > base * (1 + threshold):
+            regressions.append({'case': case, 'baseline_ns': base, 'ns': ns, 'change': round(ns / base - 1, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark EcoSnake hot paths")
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help=f"comma-separated subset of {','.join(BENCHMARKS)}")
+    parser.add_argument('--quick', action='store_true', help="fewer snake lengths")
+    parser.add_argument('--baseline', default=BENCHMARK_BASELINE_FILE, help="baseline results file")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help="allowed slowdown before failing, as a fraction (0.25 = 25%%)")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+    # Rendering changes to the game's directory; keep file arguments relative to the caller's
+    args.baseline = os.path.abspath(args.baseline)
+    args.output = args.output and os.path.abspath(args.output)
+
+    names = [name for name in args.only.split(',') if name]
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(names, args.quick)
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'unit': 'ns per call',
+        'results': results,
+    }
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('results', {})
+        report['threshold'] = args.threshold
+        report['regressions'] = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Bot Policies
+Simple policies that pick a direction for a GameEngine every tick
+"""
+
+from engine import DIRECTIONS
+
+
+def straight_policy(engine, rng):
+    """Never turn"""
+    return None
+
+
+def random_policy(engine, rng):
+    """Turn in a random direction every few ticks"""
+    if rng.random() < 0.25:
+        return rng.choice(DIRECTIONS)
+    return None
+
+
+def greedy_policy(engine, rng):
+    """Head for the trash, avoiding cells that would end the game"""
+    collector = engine.collector
+    body = collector.squares
+    cols = collector.cols
+    trash_col, trash_row = engine.trash.cell % cols, engine.trash.cell // cols
+
+    best, best_distance = None, None
+    for direction in DIRECTIONS:
+        if not engine.can_turn(direction):
+            continue
+        cell = collector.next_cell(*direction)
+        # The tail moves out of the way, so entering its cell is safe
+        if body.occupancy[cell] and not (body.occupancy[cell] == 1 and cell == body.tail_cell):
+            continue
+        distance = abs(cell % cols - trash_col) + abs(cell // cols - trash_row)
+        if best is None or distance < best_distance:
+            best, best_distance = direction, distance
+    return best
+
+
+POLICIES = {
+    'straight': straight_policy,
+    'random': random_policy,
+    'greedy': greedy_policy,
+}
@@ -28,6 +28,9 @@ GAME_NAMES = {
     'enter_player_name': 'ENTER PLAYER NAME',
     'type_your_name': 'Type your name here...',
     'game_over': 'GAME OVER!',
+    'board_cleared': 'BOARD CLEARED!',
+    'save_failed': 'Could not save your score',
+    'score_rejected': 'Score not recorded: replay check failed',
     'player': 'Player',
     'collected_trash': 'Collected Trash',
     'difficulty': 'Difficulty',
@@ -130,11 +133,18 @@ SQUARE_SIZE = 35
 WINDOW_WIDTH = 25 * SQUARE_SIZE  
 WINDOW_HEIGHT = 17 * SQUARE_SIZE  
 
+# Board grid (in cells, not pixels)
+GRID_COLS = WINDOW_WIDTH // SQUARE_SIZE
+GRID_ROWS = WINDOW_HEIGHT // SQUARE_SIZE
+
 # =============================================================================
 # GAME LOGIC CONSTANTS
 # =============================================================================
 
 TARGET_FPS = 60
+MAX_CATCH_UP_STEPS = 5  # Logic ticks allowed per frame when catching up after a slow frame
+RENDER_INTERPOLATION = True  # Slide sprites between cells instead of jumping once per tick
+RENDER_FULL_REDRAW_FRACTION = 0.05  # Redraw the whole frame once this much of the window is dirty
 # Tolerance and adjustment values
 TRASH_COLLECTION_ADJUSTMENT = 8  # Subtracted from SQUARE_SIZE for generous collection
 CURSOR_BLINK_FRAMES = 16  # Frames for cursor blink cycle
@@ -142,6 +152,41 @@ CURSOR_BLINK_FRAMES = 16  # Frames for cursor blink cycle
 COLLISION_TOLERANCE = SQUARE_SIZE // 2  # For snake self-collision
 TRASH_COLLECTION_TOLERANCE = SQUARE_SIZE - TRASH_COLLECTION_ADJUSTMENT  # More generous for trash collection
 CURSOR_BLINK_INTERVAL = TARGET_FPS * CURSOR_BLINK_FRAMES  # Cursor blink timing
+MENU_IDLE_TIMEOUT = 1000  # ms a menu sleeps waiting for input before checking again
+
+# Headless simulation
+HEADLESS_MAX_TICKS = 20000  # Stop bot games that never end (e.g. a bot circling forever)
+HEADLESS_CHUNK_SIZE = 32    # Games handed to a pool worker at a time
+
+# Session seeds and replays
+SEED_BITS = 64  # Size of the per-session seed stored in replays
+REPLAY_DIR = 'replays'  # Replays of finished sessions
+VERIFY_MAX_TICKS = 1_000_000  # Longer replays are rejected without simulating them
+REPLAY_KEYFRAME_INTERVAL = 1000  # Ticks between full-state keyframes in replay archives
+
+# Benchmarks
+BENCHMARK_BASELINE_FILE = 'benchmark_baseline.json'  # Per-machine, so not committed
+BENCHMARK_REGRESSION_THRESHOLD = 0.25  # Fail when a case gets this much slower than the baseline
+
+# Frame profiler (--perf or env ECOSNAKE_PERF=1; F3 toggles the overlay in game)
+PERF_DIR = 'perf'  # Per-session frame timings (CSV) and percentile summaries (JSON)
+PERF_WINDOW_FRAMES = 600  # Frames behind the overlay's rolling percentiles
+PERF_OVERLAY_REFRESH = 500  # ms between overlay text updates
+
+# Profiling hooks (--profile or env ECOSNAKE_PROFILE, see profiling.py)
+PROFILE_DIR = 'profiles'  # cProfile stats and tracemalloc snapshots
+PROFILE_TRACEMALLOC_FRAMES = 10  # Stack frames kept per traced allocation
+
+# Rendered text surfaces kept in the shared LRU text cache
+TEXT_CACHE_SIZE = 256
+
+# Threads decoding image assets at startup
+ASSET_LOADER_WORKERS = 4
+# Sprite sources and the prebuilt pack made by `python asset_pack.py`
+ASSETS_DIR = 'assets'
+ASSET_PACK_FILE = 'assets/assets.pack'
+# Memory allowed for full-size backgrounds (each is WINDOW_WIDTH x WINDOW_HEIGHT x 4 bytes)
+BACKGROUND_CACHE_BUDGET = 2 * WINDOW_WIDTH * WINDOW_HEIGHT * 4
 
 # =============================================================================
 # USER INTERFACE CONSTANTS
@@ -149,6 +194,7 @@ CURSOR_BLINK_INTERVAL = TARGET_FPS * CURSOR_BLINK_FRAMES  # Cursor blink timing
 
 # Base UI Layout
 UI_AREA_HEIGHT = SQUARE_SIZE
+GRID_TOP_ROW = UI_AREA_HEIGHT // SQUARE_SIZE  # First playable row below the UI strip
 UI_BORDER_HEIGHT = 2
 UI_PADDING = 10
 EDGE_MARGIN = 15
@@ -216,6 +262,7 @@ GAME_OVER_PLAYER_Y = WINDOW_HEIGHT * 170 // 600  # 170 at default, scales with w
 GAME_OVER_SCORE_Y = WINDOW_HEIGHT * 200 // 600   # 200 at default, scales with window  
 GAME_OVER_DIFFICULTY_Y = WINDOW_HEIGHT * 230 // 600  # 230 at default, scales with window
 GAME_OVER_MESSAGE_Y = WINDOW_HEIGHT * 290 // 600  # 290 at default, scales with window
+GAME_OVER_SAVE_ERROR_Y = WINDOW_HEIGHT * 320 // 600  # 320 at default, scales with window
 GAME_OVER_EXIT_Y = WINDOW_HEIGHT * 450 // 600     # 450 at default, scales with window
 
 # High scores "no scores" message position
@@ -232,8 +279,17 @@ TRASH_SPAWN_MARGIN_X = 1  # Minimum distance from left/right edges
 TRASH_SPAWN_MARGIN_Y = 3  # Minimum distance from top (accounts for UI area)
 TRASH_SPAWN_EDGE_BUFFER = 2  # Buffer from right/bottom edges
 
+# Settings persistence
+SETTINGS_FILE = 'settings.json'
+SETTINGS_MAX_BYTES = 64 * 1024  # Larger files are treated as corrupt
+SETTINGS_SAVE_DELAY = 500  # ms of quiet after the last change before settings are written
+
 # High scores configuration
 MAX_HIGH_SCORES = 10  # Maximum number of high scores to keep and display
+HIGH_SCORES_FILE = 'highscores.json'
+# 'json' keeps only the table above; 'sqlite' keeps every result (env ECOSNAKE_SCORE_BACKEND overrides)
+HIGH_SCORES_BACKEND = 'json'
+HIGH_SCORES_DB = 'highscores.db'
 
 # High score ranking colors (in order from 1st place to last)
 HIGH_SCORE_COLORS = [YELLOW, LIGHT_GRAY, ORANGE] + [CYAN] * 2 + [GRAY] * (MAX_HIGH_SCORES - 5)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Headless Simulation Core
+Game rules without pygame: movement, collisions, trash collection and score
+"""
+
+import random
+from constants import GRID_COLS, GRID_ROWS, GRID_TOP_ROW, SEED_BITS
+from game_objects import TrashCollector, Trash
+
+
+# Directions as (dir_x, dir_y)
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Outcomes reported by GameEngine.step()
+COLLECTED = 'collected'
+COLLISION = 'collision'
+BOARD_FULL = 'board_full'
+
+
+class GameEngine:
+    """A single game advanced one logic tick at a time.
+
+    The pygame front end and headless runners both drive this class, so
+    sprites are optional and only carried along for drawing. All
+    randomness comes from rng, seeded with seed (a fresh one when None),
+    so a seed plus the turns taken reproduce a game exactly. A recorder
+    with record(tick, direction) is told about every direction change.
+    """
+
+    def __init__(self, character_sprite=None, trash_sprites=None, cols=GRID_COLS, rows=GRID_ROWS, seed=None, recorder=None):
+        self.seed = random.getrandbits(SEED_BITS) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.recorder = recorder
+        self.trash_sprites = trash_sprites
+        self.collector = TrashCollector(character_sprite, cols, rows)
+        self.trash = Trash(trash_sprites, self.collector.free_cells, self.rng)
+        self.direction = RIGHT
+        self.score = 0
+        self.ticks = 0
+        self.game_over = False
+        self.board_full = False
+
+    def can_turn(self, direction):
+        """A turn is valid unless it reverses the current direction"""
+        return direction != (-self.direction[0], -self.direction[1])
+
+    def step(self, action=None):
+        """Advance one tick, turning first if action is a valid direction.
+
+        Returns COLLECTED, COLLISION, BOARD_FULL or None.
+        """
+        if self.game_over:
+            return None
+        collector = self.collector
+        if action is not None and action != self.direction and self.can_turn(action):
+            collector.dir_x, collector.dir_y = action
+            self.direction = action
+            if self.recorder:
+                self.recorder.record(self.ticks, action)
+        
+        self.ticks += 1
+        old_tail = collector.move()
+        
+        if collector.check_collision():
+            self.game_over = True
+            return COLLISION
+        
+        # Check trash collection - everything sits on the grid and
+        # TRASH_COLLECTION_TOLERANCE < SQUARE_SIZE, so this is a cell match
+        if collector.squares.head_cell == self.trash.cell:
+            collector.grow(old_tail)
+            self.score += 1
+            if not collector.free_cells:
+                # Nowhere left to spawn trash - the collector has cleared the board
+                self.game_over = True
+                self.board_full = True
+                return BOARD_FULL
+            self.trash = Trash(self.trash_sprites, collector.free_cells, self.rng)
+            return COLLECTED
+        return None
+
+    def snapshot(self):
+        """Full game state as plain data (see restore())"""
+        collector = self.collector
+        return {
+            'ticks': self.ticks,
+            'score': self.score,
+            'direction': self.direction,
+            'game_over': self.game_over,
+            'board_full': self.board_full,
+            'body': list(collector.squares.iter_cells()),
+            'free_cells': list(collector.free_cells.cells),
+            'trash_cell': self.trash.cell,
+            'trash_type': self.trash.type,
+            'rng_state': self.rng.getstate(),
+        }
+
+    def restore(self, snapshot):
+        """Continue from a snapshot taken on a board of the same size"""
+        collector = self.collector
+        self.ticks = snapshot['ticks']
+        self.score = snapshot['score']
+        self.direction = tuple(snapshot['direction'])
+        collector.dir_x, collector.dir_y = self.direction
+        self.game_over = snapshot['game_over']
+        self.board_full = snapshot['board_full']
+        collector.squares.restore(snapshot['body'])
+        collector.free_cells.restore(snapshot['free_cells'])
+        collector.previous_tail = None
+        self.trash = Trash.at(snapshot['trash_cell'], snapshot['trash_type'], self.trash_sprites, collector.cols)
+        self.rng.setstate(snapshot['rng_state'])
+
+    def run(self, turns, end_tick):
+        """Advance until end_tick or game over, turning at each (tick, direction) in turns.
+
+        Same result as calling step() every tick, but a tick that moves the
+        head onto an empty, trash-free cell can neither collide nor collect,
+        so those run in a tight loop over local variables. Turns, pickups
+        and possible collisions fall through to step().
+        """
+        collector = self.collector
+        body = collector.squares
+        cells, occupancy, capacity = body.cells, body.occupancy, body.capacity
+        free_cells = collector.free_cells
+        in_region, slots, free_list = free_cells.in_region, free_cells.slots, free_cells.cells
+        cols, rows = collector.cols, collector.rows
+        turns = iter(turns)
+        turn_tick, turn = next(turns, (None, None))
+
+        while not self.game_over and self.ticks < end_tick:
+            while turn_tick is not None and turn_tick < self.ticks:
+                turn_tick, turn = next(turns, (None, None))  # Out of order; never reached
+            if turn_tick == self.ticks:
+                self.step(turn)
+                turn_tick, turn = next(turns, (None, None))
+                continue
+
+            dir_x, dir_y = collector.dir_x, collector.dir_y
+            trash_cell = self.trash.cell
+            head, length, ticks = body.head, body.length, self.ticks
+            stop = end_tick if turn_tick is None else min(end_tick, turn_tick)
+            tail = None
+            while ticks < stop:
+                cell = cells[head]
+                col = cell % cols + dir_x
+                row = cell // cols + dir_y
+                if col < 0:
+                    col = cols - 1
+                elif col >= cols:
+                    col = 0
+                if row < GRID_TOP_ROW:
+                    row = rows - 1
+                elif row >= rows:
+                    row = GRID_TOP_ROW
+                cell = row * cols + col
+                if occupancy[cell] or cell == trash_cell:
+                    break
+
+                # SnakeBody.advance with the FreeCellIndex updates inlined
+                tail = cells[(head + length - 1) % capacity]
+                occupancy[tail] -= 1
+                if not occupancy[tail] and in_region[tail] and slots[tail] < 0:
+                    slots[tail] = len(free_list)
+                    free_list.append(tail)
+                head = (head - 1) % capacity
+                cells[head] = cell
+                occupancy[cell] = 1
+                slot = slots[cell]
+                if slot >= 0:
+                    last = free_list.pop()
+                    if last != cell:
+                        free_list[slot] = last
+                        slots[last] = slot
+                    slots[cell] = -1
+                ticks += 1
+
+            body.head, self.ticks = head, ticks
+            if tail is not None:
+                collector.previous_tail = tail
+            if ticks < stop:
+                self.step()
+        return self
@@ -1,56 +1,307 @@
 #!/usr/bin/env python3
 """
 EcoSnake Game - Core Game Objects
-TrashCollector, Trash, and related game logic
+TrashCollector, Trash, and related game logic (no pygame dependency)
 """
 
-import pygame
 import random
+from array import array
 from constants import *
 
 
+TRASH_TYPES = [item['name'] for item in TRASH_ITEMS_CONFIG]
+
+
+class BoardFullError(Exception):
+    """Raised when there is no free cell left to spawn trash on"""
+
+
+class FreeCellIndex:
+    """Free trash spawn cells as a dense array plus a cell -> slot map.
+
+    Only cells inside the TRASH_SPAWN_MARGIN_* region are tracked. Adding,
+    removing (swap-remove) and uniform sampling are all O(1).
+    """
+
+    __slots__ = ('cols', 'cells', 'slots', 'in_region')
+
+    def __init__(self, cols=GRID_COLS, rows=GRID_ROWS):
+        self.cols = cols
+        self.in_region = bytearray(cols * rows)
+        self.slots = array('i', [-1]) * (cols * rows)
+        self.cells = array('i')
+        for row in range(TRASH_SPAWN_MARGIN_Y, rows - TRASH_SPAWN_EDGE_BUFFER + 1):
+            for col in range(TRASH_SPAWN_MARGIN_X, cols - TRASH_SPAWN_EDGE_BUFFER + 1):
+                cell = row * cols + col
+                self.in_region[cell] = 1
+                self.slots[cell] = len(self.cells)
+                self.cells.append(cell)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.slots[cell] >= 0
+
+    def add(self, cell):
+        """Mark a cell as free (ignored outside the spawn region)"""
+        if self.in_region[cell] and self.slots[cell] < 0:
+            self.slots[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        """Mark a cell as taken by moving the last free cell into its slot"""
+        slot = self.slots[cell]
+        if slot < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[slot] = last
+            self.slots[last] = slot
+        self.slots[cell] = -1
+
+    def restore(self, cells):
+        """Replace the free cells with a saved list, keeping its order (sampling depends on it)"""
+        for cell in self.cells:
+            self.slots[cell] = -1
+        self.cells = array('i', cells)
+        for slot, cell in enumerate(self.cells):
+            self.slots[cell] = slot
+
+    def sample(self, rng=random):
+        """Return a uniformly random free cell, or None if the board is full"""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class SnakeBody:
+    """Fixed-capacity ring buffer of board cell indices, head first.
+
+    Supports the list operations the game loop relies on (len, indexing,
+    iteration and append) and yields pixel positions, while advancing the
+    head and growing the tail are both O(1). An occupancy grid counts the
+    segments on every cell so membership tests are a single lookup, and an
+    optional FreeCellIndex is kept in sync as cells are taken and vacated.
+    """
+
+    __slots__ = ('cols', 'capacity', 'cells', 'head', 'length', 'occupancy', 'free_cells')
+
+    def __init__(self, cols=GRID_COLS, rows=GRID_ROWS, free_cells=None):
+        self.cols = cols
+        self.free_cells = free_cells
+        self.capacity = cols * rows
+        self.cells = array('i', bytes(4 * self.capacity))
+        self.head = 0
+        self.length = 0
+        self.occupancy = bytearray(self.capacity)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        return self.position(self.cell_at(index))
+
+    def __iter__(self):
+        return self.positions()
+
+    def __contains__(self, position):
+        return self.occupancy[self.cell_index(position)] > 0
+
+    def cell_at(self, index):
+        """Return the cell index of the segment at the given body index"""
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("snake body index out of range")
+        return self.cells[(self.head + index) % self.capacity]
+
+    @property
+    def head_cell(self):
+        return self.cells[self.head]
+
+    @property
+    def tail_cell(self):
+        return self.cells[(self.head + self.length - 1) % self.capacity]
+
+    def iter_cells(self, start=0):
+        """Iterate over segment cell indices from head to tail"""
+        cells, capacity, head = self.cells, self.capacity, self.head
+        for i in range(start, self.length):
+            yield cells[(head + i) % capacity]
+
+    def positions(self, start=0):
+        """Iterate over segment pixel positions from head to tail"""
+        cols = self.cols
+        for cell in self.iter_cells(start):
+            yield ((cell % cols) * SQUARE_SIZE, (cell // cols) * SQUARE_SIZE)
+
+    def position(self, cell):
+        """Convert a cell index into the pixel position of its top-left corner"""
+        return ((cell % self.cols) * SQUARE_SIZE, (cell // self.cols) * SQUARE_SIZE)
+
+    def cell_index(self, position):
+        """Convert a pixel position into a cell index"""
+        x, y = position
+        return (y // SQUARE_SIZE) * self.cols + x // SQUARE_SIZE
+
+    def advance(self, cell):
+        """Push a new head cell and drop the tail; returns the vacated tail cell"""
+        cells, occupancy, capacity = self.cells, self.occupancy, self.capacity
+        tail = cells[(self.head + self.length - 1) % capacity]
+        occupancy[tail] -= 1
+        if not occupancy[tail] and self.free_cells is not None:
+            self.free_cells.add(tail)
+        self.head = head = (self.head - 1) % capacity
+        cells[head] = cell
+        occupancy[cell] += 1
+        if occupancy[cell] == 1 and self.free_cells is not None:
+            self.free_cells.remove(cell)
+        return tail
+
+    def grow(self, cell):
+        """Append a segment behind the current tail"""
+        if self.length >= self.capacity:
+            raise IndexError("snake body is full")
+        self.cells[(self.head + self.length) % self.capacity] = cell
+        self.occupancy[cell] += 1
+        if self.occupancy[cell] == 1 and self.free_cells is not None:
+            self.free_cells.remove(cell)
+        self.length += 1
+
+    def restore(self, cells):
+        """Replace the body with saved cells, head first (the free cell index is left alone)"""
+        self.occupancy[:] = bytes(self.capacity)
+        self.head = 0
+        self.length = len(cells)
+        for index, cell in enumerate(cells):
+            self.cells[index] = cell
+            self.occupancy[cell] += 1
+
+    def append(self, position):
+        """List-compatible append taking a pixel position"""
+        self.grow(self.cell_index(position))
+
+    def verify_occupancy(self):
+        """Check that the occupancy grid matches a recount of the body"""
+        expected = bytearray(self.capacity)
+        for cell in self.iter_cells():
+            expected[cell] += 1
+        return expected == self.occupancy
+
+    def verify_free_cells(self):
+        """Check that the free-cell index matches a full scan of the board"""
+        free_cells = self.free_cells
+        if free_cells is None:
+            return True
+        expected = {cell for cell in range(self.capacity) if free_cells.in_region[cell] and not self.occupancy[cell]}
+        slots_match = all(free_cells.slots[cell] == slot for slot, cell in enumerate(free_cells.cells))
+        return slots_match and len(free_cells.cells) == len(expected) and set(free_cells.cells) == expected
+
+
 class TrashCollector:
-    def __init__(self, character_sprite):
+    # Cross-check the occupancy grid and free-cell index against full scans (see selfcheck.py)
+    consistency_check = False
+
+    def __init__(self, character_sprite, cols=GRID_COLS, rows=GRID_ROWS):
         self.dir_x = 1
         self.dir_y = 0
-        self.squares = []
+        self.cols = cols
+        self.rows = rows
+        self.free_cells = FreeCellIndex(cols, rows)
+        self.squares = SnakeBody(cols, rows, self.free_cells)
         self.character_sprite = character_sprite
-        start_x = (WINDOW_WIDTH // 2 // SQUARE_SIZE) * SQUARE_SIZE
-        start_y = (WINDOW_HEIGHT // 2 // SQUARE_SIZE) * SQUARE_SIZE
-        self.squares.append((start_x, start_y))
+        self.squares.grow((rows // 2) * cols + cols // 2)
+        self.previous_tail = None  # Cell vacated by the last move, for interpolated drawing
 
     def move(self):
-        head_x, head_y = self.squares[0]
-        new_x = head_x + self.dir_x * SQUARE_SIZE
-        new_y = head_y + self.dir_y * SQUARE_SIZE
+        """Step one cell in the current direction; returns the vacated tail cell"""
+        self.previous_tail = self.squares.advance(self.next_cell(self.dir_x, self.dir_y))
+        return self.previous_tail
+
+    def grow(self, cell):
+        """Add a segment behind the tail (on the cell the last move vacated)"""
+        self.squares.grow(cell)
+        self.previous_tail = None
+
+    def next_cell(self, dir_x, dir_y):
+        """Cell the head would enter moving in the given direction"""
+        head = self.squares.head_cell
+        new_col = head % self.cols + dir_x
+        new_row = head // self.cols + dir_y
         
-        if new_x < 0:
-            new_x = WINDOW_WIDTH - SQUARE_SIZE
-        elif new_x >= WINDOW_WIDTH:
-            new_x = 0
+        if new_col < 0:
+            new_col = self.cols - 1
+        elif new_col >= self.cols:
+            new_col = 0
             
-        if new_y < UI_AREA_HEIGHT:
-            new_y = WINDOW_HEIGHT - SQUARE_SIZE
-        elif new_y >= WINDOW_HEIGHT:
-            new_y = UI_AREA_HEIGHT
+        if new_row < GRID_TOP_ROW:
+            new_row = self.rows - 1
+        elif new_row >= self.rows:
+            new_row = GRID_TOP_ROW
             
-        new_head = (new_x, new_y)
-        self.squares = [new_head] + self.squares[:-1]
+        return new_row * self.cols + new_col
 
-    def draw(self, screen, selected_garbage_sprite):
-        head_x, head_y = self.squares[0]
-        screen.blit(self.character_sprite, (head_x, head_y))
-        for (x, y) in self.squares[1:]:
-            screen.blit(selected_garbage_sprite, (x, y))
+    def interpolated_positions(self, alpha):
+        """Segment positions blended from the previous tick towards the current one.
+
+        Each segment was at the next segment's cell one tick ago (the tail at
+        the cell it vacated). Segments that wrapped around the board snap.
+        """
+        body = self.squares
+        cells = list(body.iter_cells())
+        previous = cells[1:]
+        previous.append(cells[-1] if self.previous_tail is None else self.previous_tail)
+        for cell, before in zip(cells, previous):
+            x, y = body.position(cell)
+            old_x, old_y = body.position(before)
+            if abs(x - old_x) > SQUARE_SIZE or abs(y - old_y) > SQUARE_SIZE:
+                yield (x, y)
+            else:
+                yield (round(old_x + (x - old_x) * alpha), round(old_y + (y - old_y) * alpha))
+
+    def sprite_placements(self, selected_garbage_sprite, alpha=1.0):
+        """(sprite, position) pairs for the head and every body segment"""
+        if alpha < 1.0:
+            positions = self.interpolated_positions(alpha)
+        else:
+            positions = self.squares.positions()
+        placements = [(self.character_sprite, next(positions))]
+        placements.extend((selected_garbage_sprite, position) for position in positions)
+        return placements
 
     def check_collision(self):
-        """Optimized collision detection - skip first few segments (can't collide immediately)"""
-        if len(self.squares) < 4:  # Can't collide with itself if too short
+        """Constant-time collision detection using the body's occupancy grid"""
+        body = self.squares
+        if len(body) < 4:  # Can't collide with itself if too short
+            collision = False
+        else:
+            # Count other segments on the head cell, skipping the first 3
+            # (head can't immediately collide with neck/shoulder)
+            cells, capacity, index = body.cells, body.capacity, body.head
+            head = cells[index]
+            hits = body.occupancy[head] - 1
+            hits -= (cells[(index + 1) % capacity] == head) + (cells[(index + 2) % capacity] == head)
+            collision = hits > 0
+        
+        if self.consistency_check:
+            expected = self._check_collision_scan()
+            if collision != expected or not body.verify_occupancy():
+                raise RuntimeError(f"Occupancy grid out of sync: grid={collision}, scan={expected}")
+            if not body.verify_free_cells():
+                raise RuntimeError("Free-cell index out of sync with the board")
+        return collision
+
+    def _check_collision_scan(self):
+        """Reference linear scan over the body, used by the consistency check"""
+        if len(self.squares) < 4:
             return False
             
         head_x, head_y = self.squares[0]
         # Skip first 3 segments (head can't immediately collide with neck/shoulder)
-        for segment_x, segment_y in self.squares[3:]:
+        for segment_x, segment_y in self.squares.positions(3):
             if (abs(head_x - segment_x) <= COLLISION_TOLERANCE and 
                 abs(head_y - segment_y) <= COLLISION_TOLERANCE):
                 return True
@@ -58,17 +309,27 @@ class TrashCollector:
 
 
 class Trash:
-    def __init__(self, trash_sprites):
-        min_x = TRASH_SPAWN_MARGIN_X
-        max_x = (WINDOW_WIDTH // SQUARE_SIZE) - TRASH_SPAWN_EDGE_BUFFER
-        min_y = TRASH_SPAWN_MARGIN_Y
-        max_y = (WINDOW_HEIGHT // SQUARE_SIZE) - TRASH_SPAWN_EDGE_BUFFER
-        
-        self.x = random.randint(min_x, max_x) * SQUARE_SIZE
-        self.y = random.randint(min_y, max_y) * SQUARE_SIZE
+    def __init__(self, trash_sprites, free_cells, rng=random):
+        # rng is the session's random.Random, so a seed reproduces every placement
+        # Sample only cells the collector does not cover
+        cell = free_cells.sample(rng)
+        if cell is None:
+            raise BoardFullError("No free cell left to spawn trash")
+        self.cell = cell
+        self.x = (cell % free_cells.cols) * SQUARE_SIZE
+        self.y = (cell // free_cells.cols) * SQUARE_SIZE
         
-        self.type = random.choice(list(trash_sprites.keys()))
-        self.sprite = trash_sprites[self.type]
+        self.type = rng.choice(TRASH_TYPES)
+        self.sprite = trash_sprites[self.type] if trash_sprites else None
     
-    def draw(self, screen):
-        screen.blit(self.sprite, (self.x, self.y))
\ No newline at end of file
+    @classmethod
+    def at(cls, cell, trash_type, trash_sprites=None, cols=GRID_COLS):
+        """Trash of a given type on a given cell, without drawing from an RNG"""
+        trash = cls.__new__(cls)
+        trash.cell = cell
+        trash.x = (cell % cols) * SQUARE_SIZE
+        trash.y = (cell // cols) * SQUARE_SIZE
+        trash.type = trash_type
+        trash.sprite = trash_sprites[trash_type] if trash_sprites else None
+        return trash
+
@@ -5,27 +5,46 @@ Handles settings persistence and game state
 """
 
 import json
-from constants import CHARACTERS_CONFIG, BACKGROUNDS_CONFIG, GARBAGE_BAGS_CONFIG
+from constants import (CHARACTERS_CONFIG, BACKGROUNDS_CONFIG, GARBAGE_BAGS_CONFIG,
+                       SETTINGS_FILE, SETTINGS_MAX_BYTES, SETTINGS_SAVE_DELAY)
+from writer import atomic_write_json
+
+
+# Persisted settings and the configuration list each must name an entry of
+SETTINGS_FIELDS = {
+    'selected_character': CHARACTERS_CONFIG,
+    'selected_background': BACKGROUNDS_CONFIG,
+    'selected_garbage': GARBAGE_BAGS_CONFIG,
+}
 
 
 class GameState:
-    def __init__(self):
+    def __init__(self, writer=None):
+        # Optional BackgroundWriter; without one settings are written immediately
+        self.writer = writer
         self.player_name = ""
+        # Settings changed since the last save
+        self.dirty = set()
         # Default selections from configuration
-        self.selected_character = CHARACTERS_CONFIG[0]['name']
-        self.selected_background = BACKGROUNDS_CONFIG[0]['name']
-        self.selected_garbage = GARBAGE_BAGS_CONFIG[0]['name']
+        self._set_default_settings()
+    
+    def __setattr__(self, name, value):
+        if name in SETTINGS_FIELDS and getattr(self, name, None) != value:
+            self.dirty.add(name)
+        super().__setattr__(name, value)
     
     def save_settings(self):
-        """Save current settings to JSON file with error handling"""
-        settings = {
-            'selected_character': self.selected_character,
-            'selected_background': self.selected_background,
-            'selected_garbage': self.selected_garbage
-        }
+        """Save changed settings; with a writer, quick successive saves become one write"""
+        if not self.dirty:
+            return
+        settings = {field: getattr(self, field) for field in SETTINGS_FIELDS}
+        self.dirty.clear()
+        if self.writer:
+            # Each save restarts the debounce window and replaces the queued snapshot
+            self.writer.submit('settings', atomic_write_json, SETTINGS_FILE, settings, delay=SETTINGS_SAVE_DELAY / 1000)
+            return
         try:
-            with open('settings.json', 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=2, ensure_ascii=False)
+            atomic_write_json(SETTINGS_FILE, settings)
         except (IOError, OSError) as e:
             print(f"Warning: Settings could not be saved: {e}")
         except Exception as e:
@@ -34,27 +53,36 @@ class GameState:
     def load_settings(self):
         """Load settings from JSON file with comprehensive error handling"""
         try:
-            with open('settings.json', 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                self.selected_character = settings.get('selected_character', CHARACTERS_CONFIG[0]['name'])
-                self.selected_background = settings.get('selected_background', BACKGROUNDS_CONFIG[0]['name'])
-                self.selected_garbage = settings.get('selected_garbage', GARBAGE_BAGS_CONFIG[0]['name'])
+            with open(SETTINGS_FILE, 'rb') as f:
+                data = f.read(SETTINGS_MAX_BYTES + 1)
+            if len(data) > SETTINGS_MAX_BYTES:
+                raise ValueError(f"larger than {SETTINGS_MAX_BYTES} bytes")
+            settings = json.loads(data)
+            if not isinstance(settings, dict):
+                raise ValueError("not a JSON object")
         except FileNotFoundError:
             print("Info: Settings file not found, using defaults")
-            self._set_default_settings()
-        except json.JSONDecodeError as e:
+            settings = {}
+        except (json.JSONDecodeError, UnicodeDecodeError, ValueError, RecursionError) as e:
+            # RecursionError: deeply nested JSON that is still under SETTINGS_MAX_BYTES
             print(f"Warning: Settings file corrupted ({e}), using defaults")
-            self._set_default_settings()
+            settings = {}
         except (IOError, OSError) as e:
             print(f"Warning: Could not read settings file ({e}), using defaults")
-            self._set_default_settings()
+            settings = {}
         except Exception as e:
             print(f"Unexpected error loading settings ({e}), using defaults")
-            self._set_default_settings()
+            settings = {}
+
+        # Unknown names (e.g. a removed character) fall back to the default for that field
+        for field, config in SETTINGS_FIELDS.items():
+            value = settings.get(field)
+            valid = any(item['name'] == value for item in config)
+            super().__setattr__(field, value if valid else config[0]['name'])
+        self.dirty.clear()
     
     def _set_default_settings(self):
         """Set default settings values"""
         # Default selections from configuration
-        self.selected_character = CHARACTERS_CONFIG[0]['name']
-        self.selected_background = BACKGROUNDS_CONFIG[0]['name']
-        self.selected_garbage = GARBAGE_BAGS_CONFIG[0]['name']
\ No newline at end of file
+        for field, config in SETTINGS_FIELDS.items():
+            super().__setattr__(field, config[0]['name'])
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - High Score Store
+Keeps the high score table indexed in memory and writes it atomically under a file lock,
+or stores the full score history in SQLite
+"""
+
+import bisect
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from constants import HIGH_SCORES_FILE, HIGH_SCORES_DB, HIGH_SCORES_BACKEND, MAX_HIGH_SCORES
+from writer import atomic_write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on a sidecar lock file, shared by every game instance"""
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after ~10 s; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _valid_entry(entry):
+    return (isinstance(entry, dict) and isinstance(entry.get('name'), str)
+            and isinstance(entry.get('score'), int) and isinstance(entry.get('difficulty'), str))
+
+
+class ScoreStore:
+    """The best score of each player, top `limit` only, best first.
+
+    Entries are kept sorted with a parallel list of negated scores for
+    bisect, plus a name -> entry index. submit() takes the lock, picks up
+    writes from other game instances, applies the score and replaces the
+    file atomically; readers never see a half-written table.
+    """
+
+    def __init__(self, path=HIGH_SCORES_FILE, limit=MAX_HIGH_SCORES):
+        self.path = path
+        self.limit = limit
+        self.entries = []
+        self._keys = []
+        self._by_name = {}
+        self._stamp = None
+        # Held while reading or changing the table; submit() may run on the background writer
+        self._lock = threading.RLock()
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _refresh(self):
+        """Reload the table if the file changed since it was last read or written"""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        self._stamp = stamp
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                scores = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, IOError, OSError, UnicodeDecodeError):
+            scores = []
+        if not isinstance(scores, list):
+            scores = []
+
+        self.entries, self._keys, self._by_name = [], [], {}
+        for entry in scores:
+            if _valid_entry(entry):
+                self._insert(dict(entry))
+
+    def _insert(self, entry):
+        """Place an entry after every equal or better score, replacing the player's old one"""
+        old = self._by_name.get(entry['name'])
+        if old is not None:
+            if entry['score'] <= old['score']:
+                return False
+            index = self.entries.index(old, bisect.bisect_left(self._keys, -old['score']))
+            del self.entries[index]
+            del self._keys[index]
+
+        # A better score than the player's old one always ranks at least as high
+        index = bisect.bisect_right(self._keys, -entry['score'])
+        if index >= self.limit:
+            return False
+        self.entries.insert(index, entry)
+        self._keys.insert(index, -entry['score'])
+        self._by_name[entry['name']] = entry
+
+        if len(self.entries) > self.limit:
+            dropped = self.entries.pop()
+            self._keys.pop()
+            del self._by_name[dropped['name']]
+        return True
+
+    def top(self, difficulty=None, limit=None):
+        """The current table, best first, optionally only one difficulty"""
+        with self._lock:
+            self._refresh()
+            entries = [dict(entry) for entry in self.entries
+                       if difficulty is None or entry['difficulty'] == difficulty]
+        return entries[:limit]
+
+    def best(self, name, difficulty=None):
+        """A player's entry if they're on the table"""
+        with self._lock:
+            self._refresh()
+            entry = self._by_name.get(name)
+        if entry is None or (difficulty is not None and entry['difficulty'] != difficulty):
+            return None
+        return dict(entry)
+
+    def submit(self, name, score, difficulty):
+        """Record a result; returns whether the table changed (raises OSError if it can't be saved)"""
+        try:
+            with self._lock, file_lock(self.path + '.lock'):
+                self._refresh()
+                if not self._insert({'name': name, 'score': score, 'difficulty': difficulty}):
+                    return False
+                atomic_write_json(self.path, self.entries)
+                self._stamp = self._file_stamp()
+                return True
+        except (IOError, OSError):
+            self._stamp = None  # Re-read whatever is on disk next time
+            raise
+
+
+class SQLiteScoreStore:
+    """Score store keeping every result in SQLite (WAL mode).
+
+    `scores` holds the full history; `best` holds each player's best
+    result and backs the main table, ranked like ScoreStore (ties keep
+    the order they were reached in). `difficulty_best` holds each
+    player's best per difficulty for the per-difficulty tables. Every
+    query is an index range scan however long the history grows.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            difficulty TEXT NOT NULL,
+            played_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_difficulty ON scores (difficulty, score DESC, id);
+        CREATE INDEX IF NOT EXISTS scores_by_name ON scores (name, score DESC, id);
+        CREATE TABLE IF NOT EXISTS best (
+            name TEXT PRIMARY KEY,
+            score INTEGER NOT NULL,
+            difficulty TEXT NOT NULL,
+            score_id INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS best_by_score ON best (score DESC, score_id);
+        CREATE TABLE IF NOT EXISTS difficulty_best (
+            name TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            score_id INTEGER NOT NULL,
+            PRIMARY KEY (name, difficulty)
+        );
+        CREATE INDEX IF NOT EXISTS difficulty_best_by_score ON difficulty_best (difficulty, score DESC, score_id);
+    """
+
+    def __init__(self, path=HIGH_SCORES_DB, limit=MAX_HIGH_SCORES, import_from=HIGH_SCORES_FILE):
+        self.path = path
+        self.limit = limit
+        # Shared with the background writer thread; _lock serializes use of the connection
+        self.db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        with self.db:
+            self.db.executescript(self.SCHEMA)
+            self._fill_difficulty_best()
+        if import_from and self.db.execute('SELECT NOT EXISTS (SELECT 1 FROM scores)').fetchone()[0]:
+            self._import_json(import_from)
+
+    def _fill_difficulty_best(self):
+        """Build difficulty_best from the history in databases created before it existed"""
+        if self.db.execute('SELECT EXISTS (SELECT 1 FROM difficulty_best)').fetchone()[0]:
+            return
+        self.db.execute(
+            'INSERT INTO difficulty_best (name, difficulty, score, score_id) '
+            'SELECT name, difficulty, score, id FROM ('
+            '    SELECT name, difficulty, score, id, '
+            '    ROW_NUMBER() OVER (PARTITION BY name, difficulty ORDER BY score DESC, id) AS rank FROM scores'
+            ') WHERE rank = 1')
+
+    def _import_json(self, path):
+        """Seed a new database with the JSON table, keeping its order"""
+        for entry in ScoreStore(path).top():
+            self.submit(entry['name'], entry['score'], entry['difficulty'])
+
+    def _query(self, sql, params):
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def top(self, difficulty=None, limit=None):
+        """Best result per player, or each player's best on one difficulty from the full history"""
+        limit = limit or self.limit
+        if difficulty is None:
+            rows = self._query(
+                'SELECT name, score, difficulty FROM best ORDER BY score DESC, score_id LIMIT ?', (limit,))
+        else:
+            rows = self._query(
+                'SELECT name, score, difficulty FROM difficulty_best WHERE difficulty = ? '
+                'ORDER BY score DESC, score_id LIMIT ?', (difficulty, limit))
+        return [{'name': name, 'score': score, 'difficulty': difficulty} for name, score, difficulty in rows]
+
+    def best(self, name, difficulty=None):
+        """A player's personal best, overall or on one difficulty"""
+        if difficulty is None:
+            rows = self._query('SELECT name, score, difficulty FROM best WHERE name = ?', (name,))
+        else:
+            rows = self._query(
+                'SELECT name, score, difficulty FROM difficulty_best WHERE name = ? AND difficulty = ?',
+                (name, difficulty))
+        return {'name': rows[0][0], 'score': rows[0][1], 'difficulty': rows[0][2]} if rows else None
+
+    def history(self, name, limit=None):
+        """A player's results, best first"""
+        rows = self._query(
+            'SELECT name, score, difficulty FROM scores WHERE name = ? ORDER BY score DESC, id LIMIT ?',
+            (name, limit or -1))
+        return [{'name': name, 'score': score, 'difficulty': difficulty} for name, score, difficulty in rows]
+
+    def submit(self, name, score, difficulty):
+        """Record a result; returns whether the player's best changed (raises sqlite3.Error if it can't be saved)"""
+        with self._lock, self.db:
+            score_id = self.db.execute(
+                'INSERT INTO scores (name, score, difficulty, played_at) VALUES (?, ?, ?, ?)',
+                (name, score, difficulty, time.time())).lastrowid
+            changed = self.db.execute(
+                'INSERT INTO best (name, score, difficulty, score_id) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET score = excluded.score, '
+                'difficulty = excluded.difficulty, score_id = excluded.score_id '
+                'WHERE excluded.score > best.score',
+                (name, score, difficulty, score_id)).rowcount
+            self.db.execute(
+                'INSERT INTO difficulty_best (name, difficulty, score, score_id) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (name, difficulty) DO UPDATE SET score = excluded.score, score_id = excluded.score_id '
+                'WHERE excluded.score > difficulty_best.score',
+                (name, difficulty, score, score_id))
+        return changed > 0
+
+
+def open_score_store(backend=None):
+    """Open the configured score store ('json' or 'sqlite'; ECOSNAKE_SCORE_BACKEND overrides)"""
+    backend = backend or os.environ.get('ECOSNAKE_SCORE_BACKEND', HIGH_SCORES_BACKEND)
+    if backend == 'sqlite':
+        try:
+            return SQLiteScoreStore()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not open score database ({e}), using {HIGH_SCORES_FILE}")
+    elif backend != 'json':
+        print(f"Warning: Unknown score backend '{backend}', using {HIGH_SCORES_FILE}")
+    return ScoreStore()
@@ -6,15 +6,99 @@ All menu-related functions and UI components
 
 import pygame
 import sys
+import weakref
 from constants import *
+from text_cache import render_text
+
+
+# Returned by menu event handlers when the screen has to be drawn again
+REDRAW = 'redraw'
+
+# Posted (from any thread) when something shown on a menu changed in the background
+STATUS_CHANGED = pygame.event.custom_type()
+
+# Events after which the menu has to be drawn again: the last presented frame
+# may be gone, or a background status changed
+REPAINT_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED, STATUS_CHANGED)
+
+# Scaled menu previews by (asset name, size) -> (weak ref to source surface, preview)
+_preview_cache = {}
+
+# Called by safe_exit before pygame shuts down (e.g. flushing pending writes)
+_exit_hooks = []
+
+
+def register_exit_hook(func):
+    """Run func() when the game exits through safe_exit"""
+    _exit_hooks.append(func)
 
 
 def safe_exit():
     """Safely exit the game"""
+    for hook in _exit_hooks:
+        try:
+            hook()
+        except Exception as e:
+            print(f"Warning: Exit hook failed: {e}")
     pygame.quit()
     sys.exit()
 
 
+def wait_for_events(timeout):
+    """Sleep until an event arrives or timeout ms pass, then return all pending events"""
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def run_menu(draw_func, handle_event_func, timeout=MENU_IDLE_TIMEOUT, redraw_on_timeout=False):
+    """Event-driven menu loop: draw once, block on input, redraw only on change.
+
+    handle_event_func(event) returns None when nothing changed, REDRAW when
+    the screen must be drawn again, or any other value to close the menu
+    with that result. timeout may be a callable returning milliseconds.
+    """
+    needs_redraw = True
+    while True:
+        if needs_redraw:
+            draw_func()
+            pygame.display.flip()
+            needs_redraw = False
+        
+        events = wait_for_events(timeout() if callable(timeout) else timeout)
+        if not events and redraw_on_timeout:
+            needs_redraw = True
+        for event in events:
+            if event.type == pygame.QUIT:
+                safe_exit()
+            if event.type in REPAINT_EVENTS:
+                needs_redraw = True
+                continue
+            result = handle_event_func(event)
+            if result == REDRAW:
+                needs_redraw = True
+            elif result is not None:
+                return result
+
+
+def get_scaled_preview(name, surface, size):
+    """Scale an asset for a menu preview once and reuse it until the asset's surface changes"""
+    key = (name, size)
+    cached = _preview_cache.get(key)
+    if cached is not None and cached[0]() is surface:
+        return cached[1]
+    preview = pygame.transform.scale(surface, size)
+    # A weak reference, so a cached preview never keeps a replaced asset alive
+    _preview_cache[key] = (weakref.ref(surface), preview)
+    return preview
+
+
+def clear_preview_cache():
+    """Drop all cached previews (e.g. after reloading assets)"""
+    _preview_cache.clear()
+
+
 def draw_menu_box(screen, box_rect, selected=False):
     """Draw a menu box with selection highlighting"""
     if selected:
@@ -34,7 +118,7 @@ def draw_selection_menu_item(screen, font, small_font, name, y, is_selected, box
     if get_sprite_func:
         sprite = get_sprite_func(name)
         if sprite:
-            large_sprite = pygame.transform.scale(sprite, (LARGE_SPRITE_SIZE, LARGE_SPRITE_SIZE))
+            large_sprite = get_scaled_preview(name, sprite, (LARGE_SPRITE_SIZE, LARGE_SPRITE_SIZE))
             sprite_rect = large_sprite.get_rect(center=(box_x + LARGE_SPRITE_SIZE, y + MENU_BOX_SPRITE_CENTER_Y))
             screen.blit(large_sprite, sprite_rect)
     elif preview_type == 'background':
@@ -42,13 +126,13 @@ def draw_selection_menu_item(screen, font, small_font, name, y, is_selected, box
     
     # Show name
     color = CYAN if is_selected else WHITE
-    name_text = font.render(name, True, color)
+    name_text = render_text(font, name, True, color)
     name_rect = name_text.get_rect(center=(box_x + MENU_TEXT_X_POSITION, y + MENU_BOX_NAME_CENTER_Y))
     screen.blit(name_text, name_rect)
     
     # Show active indicator
     if get_active_func and get_active_func(name):
-        active_text = small_font.render(GAME_NAMES['active'], True, NEON_GREEN)
+        active_text = render_text(small_font, GAME_NAMES['active'], True, NEON_GREEN)
         active_rect = active_text.get_rect(center=(box_x + MENU_TEXT_X_POSITION, y + MENU_BOX_ACTIVE_CENTER_Y))
         screen.blit(active_text, active_rect)
 
@@ -61,7 +145,7 @@ def draw_background_preview(screen, name, box_x, y, backgrounds):
         pygame.draw.rect(screen, BLACK, preview_rect, 0, BACKGROUND_PREVIEW_RADIUS)
     elif name in backgrounds:
         try:
-            preview = pygame.transform.scale(backgrounds[name], (LARGE_SPRITE_SIZE, LARGE_SPRITE_SIZE))
+            preview = get_scaled_preview(name, backgrounds[name], (LARGE_SPRITE_SIZE, LARGE_SPRITE_SIZE))
             sprite_rect = preview.get_rect(center=(box_x + LARGE_SPRITE_SIZE, y + MENU_BOX_SPRITE_CENTER_Y))
             screen.blit(preview, sprite_rect)
         except (pygame.error, ValueError, TypeError):
@@ -71,34 +155,31 @@ def draw_background_preview(screen, name, box_x, y, backgrounds):
             pygame.draw.rect(screen, color, preview_rect, 0, BACKGROUND_PREVIEW_RADIUS)
 
 
-def handle_selection_menu_input(selected, options_count, on_select_func, options):
-    """Handle input for selection menu"""
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            safe_exit()
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                return selected, True  # Exit
-            elif event.key == pygame.K_UP:
-                selected = (selected - 1) % options_count
-            elif event.key == pygame.K_DOWN:
-                selected = (selected + 1) % options_count
-            elif event.key == pygame.K_RETURN:
-                if on_select_func:
-                    on_select_func(options[selected])
-                return selected, True  # Exit
-    return selected, False
-
-
-def generic_selection_menu(screen, clock, font, large_font, small_font, title_text, options, selected_option, backgrounds=None, get_sprite_func=None, get_active_func=None, on_select_func=None, preview_type=None):
+def handle_selection_menu_event(event, selected, options_count, on_select_func, options):
+    """Handle one input event for a selection menu; returns (selected, action)"""
+    if event.type == pygame.KEYDOWN:
+        if event.key == pygame.K_ESCAPE:
+            return selected, 'exit'
+        elif event.key == pygame.K_UP:
+            return (selected - 1) % options_count, REDRAW
+        elif event.key == pygame.K_DOWN:
+            return (selected + 1) % options_count, REDRAW
+        elif event.key == pygame.K_RETURN:
+            if on_select_func:
+                on_select_func(options[selected])
+            return selected, 'exit'
+    return selected, None
+
+
+def generic_selection_menu(screen, font, large_font, small_font, title_text, options, selected_option, backgrounds=None, get_sprite_func=None, get_active_func=None, on_select_func=None, preview_type=None):
     """Simplified selection menu"""
     selected = options.index(selected_option) if selected_option in options else 0
     
-    while True:
+    def draw():
         screen.fill(BLACK)
         
         # Title
-        title = large_font.render(title_text.upper(), True, CYAN)
+        title = render_text(large_font, title_text.upper(), True, CYAN)
         title_rect = title.get_rect(center=(WINDOW_WIDTH//2, TITLE_Y_OFFSET))
         screen.blit(title, title_rect)
         
@@ -110,14 +191,13 @@ def generic_selection_menu(screen, clock, font, large_font, small_font, title_te
             y = MENU_START_Y + i * MENU_VERTICAL_SPACING
             is_selected = (i == selected)
             draw_selection_menu_item(screen, font, small_font, name, y, is_selected, box_x, get_sprite_func, get_active_func, preview_type, backgrounds)
-        
-        pygame.display.flip()
-        clock.tick(TARGET_FPS)
-        
-        # Handle input
-        selected, should_exit = handle_selection_menu_input(selected, len(options), on_select_func, options)
-        if should_exit:
-            return
+    
+    def handle_event(event):
+        nonlocal selected
+        selected, action = handle_selection_menu_event(event, selected, len(options), on_select_func, options)
+        return action
+    
+    run_menu(draw, handle_event)
 
 
 def draw_name_input_box(screen, font, input_text, box_rect):
@@ -127,9 +207,9 @@ def draw_name_input_box(screen, font, input_text, box_rect):
     
     # Show text
     if input_text:
-        text = font.render(input_text, True, WHITE)
+        text = render_text(font, input_text, True, WHITE)
     else:
-        text = font.render(GAME_NAMES['type_your_name'], True, GRAY)
+        text = render_text(font, GAME_NAMES['type_your_name'], True, GRAY)
     text_rect = text.get_rect(center=box_rect.center)
     screen.blit(text, text_rect)
     
@@ -145,19 +225,19 @@ def draw_name_input_box(screen, font, input_text, box_rect):
 def draw_name_input_instructions(screen, font, small_font, input_text):
     """Draw instructions for name input"""
     # Rules
-    rule = small_font.render(GAME_NAMES['name_length_rule'], True, GRAY)
+    rule = render_text(small_font, GAME_NAMES['name_length_rule'], True, GRAY)
     rule_rect = rule.get_rect(center=(WINDOW_WIDTH//2, NAME_INPUT_RULE_Y))
     screen.blit(rule, rule_rect)
     
     # Enter button
     enter_active = len(input_text.strip()) >= MIN_NAME_LENGTH
     enter_color = GREEN if enter_active else GRAY
-    enter_text = font.render(GAME_NAMES['confirm_button'], True, enter_color)
+    enter_text = render_text(font, GAME_NAMES['confirm_button'], True, enter_color)
     enter_rect = enter_text.get_rect(center=(WINDOW_WIDTH//2, NAME_INPUT_CONFIRM_Y))
     screen.blit(enter_text, enter_rect)
     
     # ESC instruction
-    esc_text = small_font.render(GAME_NAMES['return_instruction'], True, GRAY)
+    esc_text = render_text(small_font, GAME_NAMES['return_instruction'], True, GRAY)
     esc_rect = esc_text.get_rect(center=(WINDOW_WIDTH//2, NAME_INPUT_ESC_Y))
     screen.blit(esc_text, esc_rect)
 
@@ -180,15 +260,15 @@ def handle_name_input_event(event, input_text):
     return input_text, 'continue'
 
 
-def enter_name(screen, clock, font, large_font, small_font, game_state):
+def enter_name(screen, font, large_font, small_font, game_state):
     """Get player name input"""
     input_text = ""
     
-    while True:
+    def draw():
         screen.fill(BLACK)
         
         # Title
-        title = large_font.render(GAME_NAMES['enter_player_name'], True, YELLOW)
+        title = render_text(large_font, GAME_NAMES['enter_player_name'], True, YELLOW)
         title_rect = title.get_rect(center=(WINDOW_WIDTH//2, NAME_INPUT_TITLE_Y))
         screen.blit(title, title_rect)
         
@@ -198,15 +278,23 @@ def enter_name(screen, clock, font, large_font, small_font, game_state):
         
         # Instructions
         draw_name_input_instructions(screen, font, small_font, input_text)
-        
-        pygame.display.flip()
-        clock.tick(TARGET_FPS)
-        
-        # Handle events
-        for event in pygame.event.get():
-            input_text, action = handle_name_input_event(event, input_text)
-            if action == 'exit':
-                return False
-            elif action == 'confirm':
-                game_state.player_name = input_text
-                return True
\ No newline at end of file
+    
+    def handle_event(event):
+        nonlocal input_text
+        new_text, action = handle_name_input_event(event, input_text)
+        if action == 'exit':
+            return False
+        elif action == 'confirm':
+            game_state.player_name = new_text
+            return True
+        if new_text != input_text:
+            input_text = new_text
+            return REDRAW
+        return None
+    
+    def until_cursor_blink():
+        half_interval = CURSOR_BLINK_INTERVAL // 2
+        return half_interval - pygame.time.get_ticks() % half_interval
+    
+    # Only the blinking cursor needs a timer; redraw whenever it toggles
+    return run_menu(draw, handle_event, timeout=until_cursor_blink, redraw_on_timeout=True)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Frame Profiler
+Per-phase frame timings for diagnosing stutter, with rolling percentiles for the in-game overlay
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from constants import PERF_WINDOW_FRAMES
+
+
+PHASES = ('input', 'update', 'collision', 'render', 'flip')
+# Short names for the HUD overlay
+PHASE_LABELS = {'input': 'in', 'update': 'up', 'collision': 'col', 'render': 'draw', 'flip': 'flip'}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Splits each frame into PHASES.
+
+    The game loop calls frame() once per frame and mark(phase) after each
+    phase: the time since the previous mark is charged to that phase.
+    Functions wrapped with timed() run inside another phase (collision
+    checks inside the update) and are charged to their own phase and left
+    out of the enclosing one. Each frame also records its total time,
+    idle wait included, so a stutter shows up even when no phase explains it.
+    """
+
+    def __init__(self, window=PERF_WINDOW_FRAMES):
+        self.frames = []  # (input, update, collision, render, flip, total) in ms per finished frame
+        self.recent = deque(maxlen=window)
+        self.current = None
+        self.frame_start = self.last_mark = None
+        self.nested = 0
+
+    def frame(self):
+        """Finish the previous frame (if any) and start timing a new one"""
+        now = time.perf_counter()
+        if self.current is not None:
+            row = tuple(self.current) + ((now - self.frame_start) * 1000,)
+            self.frames.append(row)
+            self.recent.append(row)
+        self.current = [0.0] * len(PHASES)
+        self.frame_start = self.last_mark = now
+        self.nested = 0
+
+    def mark(self, phase):
+        """Charge the time since the last mark to phase"""
+        now = time.perf_counter()
+        if self.current is not None:
+            self.current[PHASES.index(phase)] += (now - self.last_mark - self.nested) * 1000
+        self.last_mark = now
+        self.nested = 0
+
+    def timed(self, func, phase):
+        """Wrap func so its time is charged to phase instead of the enclosing phase"""
+        slot = PHASES.index(phase)
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if self.current is not None:
+                    self.current[slot] += elapsed * 1000
+                self.nested += elapsed
+        return wrapper
+
+    def stats(self, frames=None):
+        """{phase or 'frame': {'p50', 'p95', 'p99', 'max'}} in ms, over the rolling window by default"""
+        frames = self.recent if frames is None else frames
+        result = {}
+        for column, name in enumerate(PHASES + ('frame',)):
+            values = sorted(row[column] for row in frames)
+            result[name] = {
+                'p50': round(percentile(values, 0.50), 3),
+                'p95': round(percentile(values, 0.95), 3),
+                'p99': round(percentile(values, 0.99), 3),
+                'max': round(values[-1], 3) if values else 0.0,
+            }
+        return result
+
+    def overlay_text(self):
+        """One-line p95 summary for the HUD"""
+        stats = self.stats()
+        phases = ' '.join(f"{PHASE_LABELS[name]} {stats[name]['p95']:.1f}" for name in PHASES)
+        return f"p95 {phases} frame {stats['frame']['p95']:.1f} (max {stats['frame']['max']:.1f})"
+
+    def dump(self, path, metadata=None):
+        """Write every frame to path.csv and a percentile summary (with metadata) to path.json"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        frames = list(self.frames)
+        with open(f'{path}.csv', 'w', newline='') as f:
+            out = csv.writer(f)
+            out.writerow(('frame',) + tuple(f'{name}_ms' for name in PHASES) + ('total_ms',))
+            for number, row in enumerate(frames):
+                out.writerow((number,) + tuple(f'{value:.3f}' for value in row))
+        summary = dict(metadata or {}, frames=len(frames), stats=self.stats(frames))
+        with open(f'{path}.json', 'w') as f:
+            json.dump(summary, f, indent=2)
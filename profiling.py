@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Profiling Hooks
+Runs game sessions (or the whole game) under cProfile and/or tracemalloc
+
+Enable with `--profile cpu,memory` (or env ECOSNAKE_PROFILE=cpu,memory) and
+`--profile-scope session|run` (or env ECOSNAKE_PROFILE_SCOPE). Results go to
+PROFILE_DIR as <time>-<difficulty>-<score>.pstats / .tracemalloc; inspect them with
+    python -m pstats profiles/<file>.pstats
+    tracemalloc.Snapshot.load('profiles/<file>.tracemalloc').statistics('lineno')
+"""
+
+import cProfile
+import functools
+import os
+import time
+import tracemalloc
+from constants import PROFILE_DIR, PROFILE_TRACEMALLOC_FRAMES
+from menus import register_exit_hook
+
+
+PROFILE_MODES = ('cpu', 'memory')
+PROFILE_SCOPES = ('session', 'run')
+
+
+def parse_modes(text):
+    """'cpu', 'memory', 'cpu,memory' or 'all' -> tuple of modes; raises ValueError otherwise"""
+    modes = PROFILE_MODES if text.strip() == 'all' else tuple(mode.strip() for mode in text.split(',') if mode.strip())
+    unknown = [mode for mode in modes if mode not in PROFILE_MODES]
+    if unknown or not modes:
+        raise ValueError(f"unknown profile mode {', '.join(unknown) or repr(text)} (use {', '.join(PROFILE_MODES)} or all)")
+    return modes
+
+
+class Profiler:
+    """One profiled stretch of the game: start(), then stop(tag) writes the results"""
+
+    def __init__(self, modes, directory=PROFILE_DIR):
+        self.modes = modes
+        self.directory = directory
+        self.cpu = None
+
+    def start(self):
+        if 'memory' in self.modes:
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+        if 'cpu' in self.modes:
+            self.cpu = cProfile.Profile()
+            self.cpu.enable()
+
+    def stop(self, tag):
+        """Stop profiling and write the results; returns the paths written"""
+        if self.cpu:
+            self.cpu.disable()
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{tag}")
+        paths = []
+        if self.cpu:
+            self.cpu.dump_stats(f'{base}.pstats')
+            paths.append(f'{base}.pstats')
+            self.cpu = None
+        if 'memory' in self.modes and tracemalloc.is_tracing():
+            # Only allocations made while tracing, and still alive, are in the snapshot
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(f'{base}.tracemalloc')
+            paths.append(f'{base}.tracemalloc')
+            print(f"Info: Peak traced memory {peak / 1024:.0f} KiB")
+        return paths
+
+
+def _write(profiler, tag):
+    try:
+        for path in profiler.stop(tag):
+            print(f"Info: Profile written to {path}")
+    except (IOError, OSError) as e:
+        print(f"Warning: Profile could not be saved: {e}")
+
+
+def profile_sessions(game, modes):
+    """Profile each run_game_session call separately, tagged with its difficulty and final score.
+
+    Profiling stops when the game ends, before the game over screen, so its
+    idle wait for input (and the high score table) isn't in the results.
+    """
+    run_game_session = game.run_game_session
+    game_over_screen = game.game_over_screen
+
+    @functools.wraps(run_game_session)
+    def profiled(game_speed, difficulty_name):
+        profiler = Profiler(modes)
+        stopped = False
+
+        def stop():
+            nonlocal stopped
+            if not stopped:
+                stopped = True
+                score = game.engine.score if game.engine else 0
+                _write(profiler, f'{difficulty_name}-{score}')
+
+        @functools.wraps(game_over_screen)
+        def game_over(*args, **kwargs):
+            stop()
+            return game_over_screen(*args, **kwargs)
+
+        game.game_over_screen = game_over
+        profiler.start()
+        try:
+            return run_game_session(game_speed, difficulty_name)
+        finally:
+            # Sessions left with ESC, or by closing the window (safe_exit raises SystemExit)
+            stop()
+            game.game_over_screen = game_over_screen
+    game.run_game_session = profiled
+
+
+def profile_run(game, modes):
+    """Profile everything from now until the game exits (Game.run() only ends through safe_exit)"""
+    profiler = Profiler(modes)
+    register_exit_hook(lambda: _write(profiler, 'run'))
+    profiler.start()
+
+
+def install_profiling(game, modes, scope='session'):
+    """Profile a Game per session or for its whole run; modes as accepted by parse_modes()"""
+    modes = parse_modes(modes)
+    if scope not in PROFILE_SCOPES:
+        raise ValueError(f"unknown profile scope {scope!r} (use {', '.join(PROFILE_SCOPES)})")
+    if scope == 'run':
+        profile_run(game, modes)
+    else:
+        profile_sessions(game, modes)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Dirty Rectangle Renderer
+Redraws and presents only the parts of the game screen that changed
+"""
+
+import pygame
+from collections import Counter
+from constants import BLACK, WINDOW_WIDTH, WINDOW_HEIGHT, UI_AREA_HEIGHT, SQUARE_SIZE, RENDER_FULL_REDRAW_FRACTION
+
+
+HUD_RECT = pygame.Rect(0, 0, WINDOW_WIDTH, UI_AREA_HEIGHT)
+# Changed square-sized placements past which a full redraw is cheaper
+FULL_REDRAW_RECTS = int(RENDER_FULL_REDRAW_FRACTION * WINDOW_WIDTH * WINDOW_HEIGHT) // (SQUARE_SIZE * SQUARE_SIZE)
+
+
+class DirtyRectRenderer:
+    """Tracks the sprites drawn last frame and pushes only changed rects.
+
+    A frame is described by its background, an ordered list of
+    (sprite, position) placements and a HUD key. Placements that appeared
+    or disappeared are repainted (background plus every placement that
+    overlaps them, clipped, in draw order) and handed to
+    pygame.display.update(). Identical frames are not presented at all.
+
+    Past FULL_REDRAW_RECTS changed placements (RENDER_FULL_REDRAW_FRACTION
+    of the window) the frame is redrawn and flipped whole, which is cheaper
+    than repainting rect by rect. That is decided before diffing whenever
+    possible: mid-tick with RENDER_INTERPOLATION every segment moves every
+    frame, so a long interpolated snake, or a frame whose placement count
+    changed, goes straight to a full redraw.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        # Optional FrameProfiler; drawing and presenting are timed as separate phases
+        self.profiler = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Force the next frame to be fully redrawn (new session, window exposed)"""
+        self.placements = None
+        self.hud_key = None
+
+    def _restore_background(self, background, rect=None):
+        if background is not None:
+            if rect is None:
+                self.screen.blit(background, (0, 0))
+            else:
+                self.screen.blit(background, rect, rect)
+        else:
+            self.screen.fill(BLACK, rect)
+
+    def render(self, background, placements, hud_key, draw_hud, interpolating=False):
+        """Draw a frame; returns False when nothing changed and nothing was presented.
+
+        interpolating: the placements are mid-tick, so every one of them moved
+        """
+        screen = self.screen
+        if (self.placements is None or len(placements) != len(self.placements)
+                or (interpolating and 2 * len(placements) > FULL_REDRAW_RECTS)):
+            return self._redraw(background, placements, hud_key, draw_hud)
+
+        hud_changed = hud_key != self.hud_key
+        if not hud_changed and placements == self.placements:
+            return False
+
+        # Compare as multisets: a tail segment doubled up after growth is
+        # blitted twice, which matters for sprites with soft alpha edges
+        previous, current = Counter(self.placements), Counter(placements)
+        changed = (previous - current) + (current - previous)
+        if sum(changed.values()) > FULL_REDRAW_RECTS:
+            return self._redraw(background, placements, hud_key, draw_hud)
+        dirty = [pygame.Rect(position, sprite.get_size()) for sprite, position in changed]
+
+        # Bucket placements by the grid square of their top-left corner; a
+        # sprite no larger than a square can only overlap a dirty rect from
+        # the squares around the rect's own
+        rects = [pygame.Rect(position, sprite.get_size()) for sprite, position in placements]
+        buckets = {}
+        for i, rect in enumerate(rects):
+            buckets.setdefault((rect.x // SQUARE_SIZE, rect.y // SQUARE_SIZE), []).append(i)
+        for rect in dirty:
+            col, row = rect.x // SQUARE_SIZE, rect.y // SQUARE_SIZE
+            overlapping = sorted(i for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                                 for i in buckets.get((col + dx, row + dy), ()) if rect.colliderect(rects[i]))
+            screen.set_clip(rect)
+            self._restore_background(background, rect)
+            for i in overlapping:
+                screen.blit(placements[i][0], rects[i])
+        screen.set_clip(None)
+
+        if hud_changed:
+            draw_hud()
+            dirty.append(HUD_RECT)
+
+        self._present(dirty)
+        self.placements, self.hud_key = placements, hud_key
+        return True
+
+    def _redraw(self, background, placements, hud_key, draw_hud):
+        """Draw and present the whole frame"""
+        self._restore_background(background)
+        self.screen.blits(placements, doreturn=False)
+        draw_hud()
+        self._present()
+        self.placements, self.hud_key = placements, hud_key
+        return True
+
+    def _present(self, rects=None):
+        profiler = self.profiler
+        if profiler:
+            profiler.mark('render')
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        if profiler:
+            profiler.mark('flip')
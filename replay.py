@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Session Replays
+Compact binary record of a session: its seed plus every direction change
+
+Layout (integers little-endian, varints LEB128):
+    header   magic, version, seed (u64), cols, rows, square size (u16 each),
+             difficulty and player name (varint length + UTF-8)
+    turns    varint count, then one varint per turn: tick delta << 2 | direction
+    trailer  varint end tick, varint score
+"""
+
+import os
+import struct
+from constants import GRID_COLS, GRID_ROWS, SQUARE_SIZE
+from engine import GameEngine, DIRECTIONS
+
+
+REPLAY_MAGIC = b'ESRP'
+REPLAY_VERSION = 1
+# Magic, version, seed, cols, rows, square size
+REPLAY_HEADER = struct.Struct('<4sBQHHH')
+
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+
+def write_varint(buffer, value):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    """Decode a varint at offset; returns (value, next offset)"""
+    value = shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError('truncated replay')
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _write_text(buffer, text):
+    encoded = text.encode('utf-8')
+    write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+def _read_text(data, offset):
+    length, offset = read_varint(data, offset)
+    if offset + length > len(data):
+        raise ValueError('truncated replay')
+    return bytes(data[offset:offset + length]).decode('utf-8'), offset + length
+
+
+class ReplayRecorder:
+    """GameEngine recorder: keeps the (tick, direction) of every turn.
+
+    Called only when the direction actually changes, so a session costs
+    one list append per turn and nothing on other ticks.
+    """
+
+    def __init__(self):
+        self.turns = []
+
+    def record(self, tick, direction):
+        self.turns.append((tick, direction))
+
+
+class Replay:
+    """A recorded session: enough to re-simulate it exactly with simulate()"""
+
+    def __init__(self, seed, difficulty, player='', turns=(), end_tick=0, score=0,
+                 cols=GRID_COLS, rows=GRID_ROWS, square_size=SQUARE_SIZE):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.player = player
+        self.turns = list(turns)
+        self.end_tick = end_tick
+        self.score = score
+        self.cols = cols
+        self.rows = rows
+        self.square_size = square_size
+
+    @classmethod
+    def from_engine(cls, engine, recorder, difficulty, player=''):
+        """Replay of a session recorded into recorder, ending at the engine's current tick"""
+        return cls(engine.seed, difficulty, player, recorder.turns, engine.ticks, engine.score,
+                   engine.collector.cols, engine.collector.rows)
+
+    def to_bytes(self):
+        buffer = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed,
+                                              self.cols, self.rows, self.square_size))
+        _write_text(buffer, self.difficulty)
+        _write_text(buffer, self.player)
+        write_varint(buffer, len(self.turns))
+        previous = 0
+        for tick, direction in self.turns:
+            write_varint(buffer, (tick - previous) << 2 | DIRECTION_CODES[direction])
+            previous = tick
+        write_varint(buffer, self.end_tick)
+        write_varint(buffer, self.score)
+        return bytes(buffer)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse a replay; raises ValueError if data isn't a valid replay"""
+        if len(data) < REPLAY_HEADER.size:
+            raise ValueError('truncated replay')
+        magic, version, seed, cols, rows, square_size = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError('not an EcoSnake replay')
+        if version != REPLAY_VERSION:
+            raise ValueError(f'unsupported replay version {version}')
+        offset = REPLAY_HEADER.size
+        difficulty, offset = _read_text(data, offset)
+        player, offset = _read_text(data, offset)
+
+        count, offset = read_varint(data, offset)
+        turns = []
+        tick = 0
+        for _ in range(count):
+            value, offset = read_varint(data, offset)
+            tick += value >> 2
+            turns.append((tick, DIRECTIONS[value & 3]))
+        end_tick, offset = read_varint(data, offset)
+        score, offset = read_varint(data, offset)
+        return cls(seed, difficulty, player, turns, end_tick, score, cols, rows, square_size)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def simulate(replay, max_ticks=None):
+    """Re-run a replay headless and return the engine where it stopped"""
+    engine = GameEngine(cols=replay.cols, rows=replay.rows, seed=replay.seed)
+    end_tick = replay.end_tick if max_ticks is None else min(replay.end_tick, max_ticks)
+    return engine.run(replay.turns, end_tick)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Replay Archive
+Many replays in one file, indexed by player, difficulty and score, with
+periodic full-state keyframes so any tick can be reached without replaying from tick 0
+
+Layout:
+    header     magic, version, index offset (u64)
+    entries    per replay: its replay bytes, then its keyframes (zlib-compressed)
+    index      zlib-compressed JSON: per entry its offsets, metadata and keyframe table
+
+    python replay_archive.py build archive.esra replays/*.replay
+    python replay_archive.py list archive.esra --difficulty Hard
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from constants import REPLAY_KEYFRAME_INTERVAL
+from engine import GameEngine, DIRECTIONS
+from game_objects import TRASH_TYPES
+from replay import Replay, DIRECTION_CODES
+
+
+ARCHIVE_MAGIC = b'ESRA'
+ARCHIVE_VERSION = 1
+# Magic, version, index offset
+ARCHIVE_HEADER = struct.Struct('<4sB3xQ')
+# Ticks, score, direction, flags (game over, board full), trash cell, trash type, body length, free cells
+KEYFRAME_HEADER = struct.Struct('<IIBBHBHH')
+RNG_STATE_VERSION = 3
+
+
+def pack_keyframe(snapshot):
+    """Encode a GameEngine snapshot"""
+    version, state, gauss_next = snapshot['rng_state']
+    if version != RNG_STATE_VERSION or gauss_next is not None:
+        raise ValueError('unsupported RNG state')
+    flags = snapshot['game_over'] | snapshot['board_full'] << 1
+    data = KEYFRAME_HEADER.pack(snapshot['ticks'], snapshot['score'], DIRECTION_CODES[snapshot['direction']],
+                                flags, snapshot['trash_cell'], TRASH_TYPES.index(snapshot['trash_type']),
+                                len(snapshot['body']), len(snapshot['free_cells']))
+    data += array('H', snapshot['body']).tobytes() + array('H', snapshot['free_cells']).tobytes()
+    data += array('I', state).tobytes()
+    return zlib.compress(data)
+
+
+def unpack_keyframe(blob):
+    """Decode a keyframe back into a snapshot for GameEngine.restore()"""
+    data = zlib.decompress(blob)
+    ticks, score, direction, flags, trash_cell, trash_type, body_length, free_length = KEYFRAME_HEADER.unpack_from(data)
+    offset = KEYFRAME_HEADER.size
+    body = array('H', data[offset:offset + 2 * body_length])
+    offset += 2 * body_length
+    free_cells = array('H', data[offset:offset + 2 * free_length])
+    offset += 2 * free_length
+    state = array('I', data[offset:])
+    return {
+        'ticks': ticks,
+        'score': score,
+        'direction': DIRECTIONS[direction],
+        'game_over': bool(flags & 1),
+        'board_full': bool(flags & 2),
+        'body': list(body),
+        'free_cells': list(free_cells),
+        'trash_cell': trash_cell,
+        'trash_type': TRASH_TYPES[trash_type],
+        'rng_state': (RNG_STATE_VERSION, tuple(state), None),
+    }
+
+
+def compute_keyframes(replay, interval=REPLAY_KEYFRAME_INTERVAL):
+    """Simulate a replay, snapshotting it at tick 0 and every interval ticks"""
+    engine = GameEngine(cols=replay.cols, rows=replay.rows, seed=replay.seed)
+    turn_ticks = [tick for tick, _ in replay.turns]
+    keyframes = [engine.snapshot()]
+    tick = interval
+    while tick < replay.end_tick and not engine.game_over:
+        first_turn = bisect.bisect_left(turn_ticks, engine.ticks)
+        engine.run(replay.turns[first_turn:], tick)
+        keyframes.append(engine.snapshot())
+        tick += interval
+    return keyframes
+
+
+class ReplayArchiveWriter:
+    """Writes replays and their keyframes to a new archive; use as a context manager"""
+
+    def __init__(self, path, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.entries = []
+        self.file = open(path, 'wb')
+        self.file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0))
+
+    def add(self, replay):
+        """Append a replay; its keyframes are computed by simulating it"""
+        data = replay.to_bytes()
+        entry = {
+            'offset': self.file.tell(),
+            'length': len(data),
+            'player': replay.player,
+            'difficulty': replay.difficulty,
+            'score': replay.score,
+            'ticks': replay.end_tick,
+            'keyframes': [],
+        }
+        self.file.write(data)
+        for snapshot in compute_keyframes(replay, self.keyframe_interval):
+            blob = pack_keyframe(snapshot)
+            entry['keyframes'].append([snapshot['ticks'], self.file.tell(), len(blob)])
+            self.file.write(blob)
+        self.entries.append(entry)
+        return len(self.entries) - 1
+
+    def close(self):
+        """Write the index and point the header at it"""
+        index_offset = self.file.tell()
+        index = {'keyframe_interval': self.keyframe_interval, 'entries': self.entries}
+        self.file.write(zlib.compress(json.dumps(index).encode('utf-8')))
+        self.file.seek(0)
+        self.file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayArchive:
+    """Read-only, memory-mapped view of an archive.
+
+    find() answers player/difficulty/score queries from in-memory indexes
+    built once on open; seek() restores the nearest keyframe at or before
+    a tick and simulates forward from there.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_offset = ARCHIVE_HEADER.unpack_from(self._map)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError('not an EcoSnake replay archive')
+        if version != ARCHIVE_VERSION or not index_offset:
+            raise ValueError(f'unsupported or unfinished archive (version {version})')
+        index = json.loads(zlib.decompress(self._map[index_offset:]))
+        self.keyframe_interval = index['keyframe_interval']
+        self.entries = index['entries']
+
+        self.by_player = {}
+        self.by_difficulty = {}
+        for number, entry in enumerate(self.entries):
+            self.by_player.setdefault(entry['player'], []).append(number)
+            self.by_difficulty.setdefault(entry['difficulty'], []).append(number)
+        # Entry numbers best score first, ties in archive order
+        self.by_score = sorted(range(len(self.entries)), key=lambda number: -self.entries[number]['score'])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def find(self, player=None, difficulty=None, min_score=None, limit=None):
+        """Entry numbers matching every given filter, best score first"""
+        candidates = None
+        for key, table in ((player, self.by_player), (difficulty, self.by_difficulty)):
+            if key is not None:
+                numbers = set(table.get(key, ()))
+                candidates = numbers if candidates is None else candidates & numbers
+        results = []
+        for number in self.by_score:
+            if min_score is not None and self.entries[number]['score'] < min_score:
+                break
+            if candidates is None or number in candidates:
+                results.append(number)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def replay(self, number):
+        """Load one archived replay"""
+        entry = self.entries[number]
+        return Replay.from_bytes(self._map[entry['offset']:entry['offset'] + entry['length']])
+
+    def seek(self, number, tick, replay=None):
+        """GameEngine holding the state of an archived replay at a tick (or where the game ended)"""
+        replay = replay or self.replay(number)
+        keyframes = self.entries[number]['keyframes']
+        position = bisect.bisect_right([frame[0] for frame in keyframes], tick) - 1
+        _, offset, length = keyframes[max(position, 0)]
+
+        engine = GameEngine(cols=replay.cols, rows=replay.rows, seed=replay.seed)
+        engine.restore(unpack_keyframe(self._map[offset:offset + length]))
+        first_turn = bisect.bisect_left([turn_tick for turn_tick, _ in replay.turns], engine.ticks)
+        return engine.run(replay.turns[first_turn:], min(tick, replay.end_tick))
+
+    def close(self):
+        self._map.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query EcoSnake replay archives")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="pack replay files into a new archive")
+    build.add_argument('archive')
+    build.add_argument('replays', nargs='+')
+    build.add_argument('--keyframe-interval', type=int, default=REPLAY_KEYFRAME_INTERVAL, help="ticks between keyframes")
+    listing = commands.add_parser('list', help="print matching entries as JSON, best score first")
+    listing.add_argument('archive')
+    listing.add_argument('--player')
+    listing.add_argument('--difficulty')
+    listing.add_argument('--min-score', type=int)
+    listing.add_argument('--limit', type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        with ReplayArchiveWriter(args.archive, args.keyframe_interval) as writer:
+            for path in args.replays:
+                try:
+                    writer.add(Replay.load(path))
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Skipping '{path}': {e}", file=sys.stderr)
+        print(f"Archived {len(writer.entries)} replays")
+    else:
+        archive = ReplayArchive(args.archive)
+        numbers = archive.find(args.player, args.difficulty, args.min_score, args.limit)
+        entries = [dict({key: value for key, value in archive.entries[number].items()
+                         if key not in ('offset', 'length', 'keyframes')}, entry=number) for number in numbers]
+        print(json.dumps(entries, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
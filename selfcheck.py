@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Self Checks
+Plays bot games with the game's internal consistency checks switched on
+
+    python selfcheck.py --games 200
+"""
+
+import argparse
+import random
+import sys
+from constants import HEADLESS_MAX_TICKS
+from engine import DIRECTIONS, GameEngine
+from replay import ReplayRecorder
+from bots import POLICIES
+from game_objects import TrashCollector, Trash
+try:
+    import batch
+except ImportError:  # NumPy is optional; only batch.py needs it
+    batch = None
+
+
+def check_consistency(games, max_ticks=HEADLESS_MAX_TICKS):
+    """Play random and greedy games with TrashCollector.consistency_check on.
+
+    Every tick cross-checks the occupancy grid and the free-cell index
+    against full scans of the board; returns a list of failures.
+    """
+    failures = []
+    TrashCollector.consistency_check = True
+    try:
+        for seed in range(games):
+            policy_name = 'random' if seed % 2 else 'greedy'
+            engine = GameEngine(seed=seed)
+            rng = random.Random(seed)
+            try:
+                while not engine.game_over and engine.ticks < max_ticks:
+                    engine.step(POLICIES[policy_name](engine, rng))
+            except RuntimeError as e:
+                failures.append(f"consistency: seed {seed} ({policy_name}) at tick {engine.ticks}: {e}")
+    finally:
+        TrashCollector.consistency_check = False
+    return failures
+
+
+def check_run_matches_step(games, max_ticks=HEADLESS_MAX_TICKS):
+    """Replay bot games through GameEngine.run() and compare with stepping them tick by tick.
+
+    Each game is checked at its end and at a mid-game stop; returns a list of failures.
+    """
+    failures = []
+    for seed in range(games):
+        policy_name = 'random' if seed % 2 else 'greedy'
+        recorder = ReplayRecorder()
+        engine = GameEngine(seed=seed, recorder=recorder)
+        rng = random.Random(seed)
+        midpoint = None
+        while not engine.game_over and engine.ticks < max_ticks:
+            engine.step(POLICIES[policy_name](engine, rng))
+            if midpoint is None and engine.ticks >= 100 + seed % 97:
+                midpoint = engine.snapshot()
+
+        for expected in (midpoint, engine.snapshot()):
+            if expected is None:
+                continue
+            fast = GameEngine(seed=seed).run(recorder.turns, expected['ticks'])
+            if fast.snapshot() != expected:
+                failures.append(f"run: seed {seed} ({policy_name}) differs from step() at tick {expected['ticks']}")
+    return failures
+
+
+def check_batch_matches_engine(games, max_ticks=HEADLESS_MAX_TICKS):
+    """Play the same bot actions through one BatchEngine and a GameEngine per game.
+
+    BatchEngine draws trash from NumPy's generator, so each GameEngine's
+    trash is pinned to the batch's cell after every spawn. Bodies, scores
+    and deaths must then agree tick by tick; returns a list of failures.
+    """
+    failures = []
+    sim = batch.BatchEngine(games, seed=0)
+    engines = [GameEngine(seed=seed) for seed in range(games)]
+    rngs = [random.Random(seed) for seed in range(games)]
+    policies = ['random' if seed % 2 else 'greedy' for seed in range(games)]
+    failed = [False] * games
+    for game, engine in enumerate(engines):
+        engine.trash = Trash.at(int(sim.trash[game]), engine.trash.type, cols=engine.collector.cols)
+
+    for _ in range(max_ticks):
+        live = [game for game in range(games) if not failed[game] and not engines[game].game_over]
+        if not live:
+            break
+        actions = [batch.NO_ACTION] * games
+        for game in live:
+            action = POLICIES[policies[game]](engines[game], rngs[game])
+            if action is not None:
+                actions[game] = DIRECTIONS.index(action)
+        sim.step(actions)
+
+        for game in live:
+            engine = engines[game]
+            action = actions[game]
+            engine.step(None if action == batch.NO_ACTION else DIRECTIONS[action])
+            body = list(engine.collector.squares.iter_cells())
+            mismatch = None
+            if body != sim.body_cells(game).tolist():
+                mismatch = "body"
+            elif engine.score != sim.score[game]:
+                mismatch = f"score {engine.score} != {sim.score[game]}"
+            elif engine.game_over == bool(sim.alive[game]) or engine.board_full != bool(sim.board_full[game]):
+                mismatch = "game over"
+            if mismatch:
+                failed[game] = True
+                failures.append(f"batch: game {game} ({policies[game]}) differs at tick {engine.ticks}: {mismatch}")
+            elif not engine.game_over and engine.trash.cell != sim.trash[game]:
+                # Picked up: follow the batch's new trash cell
+                engine.trash = Trash.at(int(sim.trash[game]), engine.trash.type, cols=engine.collector.cols)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run EcoSnake self checks")
+    parser.add_argument('--games', type=int, default=100, help="games per check")
+    args = parser.parse_args(argv)
+
+    failures = check_consistency(args.games) + check_run_matches_step(args.games)
+    if batch:
+        failures += check_batch_matches_engine(args.games)
+    else:
+        print("Info: NumPy is not installed, skipping the batch simulator check")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{'FAILED' if failures else 'OK'}: {args.games} games checked")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Sprite Manager
+Display-format conversion and a packed atlas for the small game sprites
+"""
+
+import math
+import pygame
+from constants import SQUARE_SIZE
+
+
+def convert_for_display(surface, alpha=True):
+    """Convert a surface to the display's pixel format (needs a display mode set)"""
+    if alpha and (surface.get_flags() & pygame.SRCALPHA or surface.get_alpha() is not None):
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+class SpriteManager:
+    """Packs same-sized sprites into one display-format atlas surface.
+
+    Sprites are added by name, then build() blits them into a grid on a
+    single convert_alpha() surface. get() returns a subsurface that can be
+    blitted like any sprite; rect() gives its area in the atlas for
+    screen.blit(manager.atlas, position, rect).
+    """
+
+    def __init__(self, cell_size=SQUARE_SIZE):
+        self.cell_size = cell_size
+        self.atlas = None
+        self._pending = {}
+        self._rects = {}
+        self._sprites = {}
+
+    def add(self, name, surface):
+        """Queue a sprite for packing"""
+        self._pending[name] = surface
+
+    def build(self):
+        """Pack all queued sprites into the atlas and convert it once"""
+        names = list(self._rects) + [name for name in self._pending if name not in self._rects]
+        sources = {name: self._sprites[name] for name in self._rects}
+        sources.update(self._pending)
+
+        columns = max(1, math.ceil(math.sqrt(len(names))))
+        rows = max(1, math.ceil(len(names) / columns))
+        atlas = pygame.Surface((columns * self.cell_size, rows * self.cell_size), pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+
+        self._rects = {}
+        for index, name in enumerate(names):
+            x = (index % columns) * self.cell_size
+            y = (index // columns) * self.cell_size
+            sprite = sources[name]
+            # BLEND_RGBA_MAX onto a cleared atlas copies pixels and alpha unchanged
+            atlas.blit(sprite, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            self._rects[name] = pygame.Rect(x, y, *sprite.get_size())
+
+        self.atlas = convert_for_display(atlas)
+        self._sprites = {name: self.atlas.subsurface(rect) for name, rect in self._rects.items()}
+        self._pending = {}
+
+    def get(self, name):
+        """Atlas-backed sprite surface for a name"""
+        return self._sprites[name]
+
+    def rect(self, name):
+        """Sub-rect of a sprite inside the atlas"""
+        return self._rects[name]
+
+    def blit(self, screen, name, position):
+        """Blit a sprite straight from the atlas"""
+        screen.blit(self.atlas, position, self._rects[name])
@@ -39,7 +39,7 @@ if not exist .venv (
     REM Activate
     call .venv\Scripts\activate.bat
     
-    REM Install Pygame
+    REM Install Pygame (batch.py also needs NumPy: pip install numpy)
     echo [*] Installing Pygame...
     python -m pip install --quiet --upgrade pip
     python -m pip install --quiet pygame
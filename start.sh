@@ -30,7 +30,7 @@ if [ ! -d ".venv" ]; then
     # Activate
     source .venv/bin/activate
     
-    # Install Pygame
+    # Install Pygame (batch.py also needs NumPy: pip install numpy)
     echo "📥 Installing Pygame..."
     pip install --quiet --upgrade pip
     pip install --quiet pygame
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Text Surface Cache
+Shared LRU cache for rendered text so static labels aren't re-rendered every frame
+"""
+
+from collections import OrderedDict
+from constants import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """Size-bounded LRU cache of font.render() results"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Return a cached surface for (font, text, antialias, color), rendering on a miss"""
+        key = (font, text, antialias, tuple(color))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+        }
+
+
+# Shared by the game screens and the menus
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Render text through the shared cache (the result must not be modified)"""
+    return text_cache.render(font, text, antialias, color)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Headless Tournament Runner
+Plays many bot games across a process pool and summarizes the results
+"""
+
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from constants import HEADLESS_MAX_TICKS, HEADLESS_CHUNK_SIZE
+from engine import GameEngine
+from bots import POLICIES
+
+
+# The engine's RNG is seeded with the game's seed; the bot's own RNG gets a
+# different seed so its choices aren't correlated with trash placement
+POLICY_SEED_SALT = 0x5EED
+
+
+def play_game(policy_name, seed, max_ticks=HEADLESS_MAX_TICKS):
+    """Play one headless game and return its result"""
+    policy = POLICIES[policy_name]
+    rng = random.Random((seed << 1) ^ POLICY_SEED_SALT)
+    engine = GameEngine(seed=seed)
+
+    while not engine.game_over and engine.ticks < max_ticks:
+        engine.step(policy(engine, rng))
+
+    if engine.board_full:
+        outcome = 'board_full'
+    elif engine.game_over:
+        outcome = 'collision'
+    else:
+        outcome = 'timeout'
+    return {'seed': seed, 'score': engine.score, 'ticks': engine.ticks, 'outcome': outcome}
+
+
+def _play_chunk(args):
+    """Pool worker: play a chunk of seeds"""
+    policy_name, seeds, max_ticks = args
+    return [play_game(policy_name, seed, max_ticks) for seed in seeds]
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def summarize(results, elapsed, speed):
+    """Build the throughput and score distribution report"""
+    scores = sorted(result['score'] for result in results)
+    total_ticks = sum(result['ticks'] for result in results)
+    outcomes = {}
+    histogram = {}
+    for result in results:
+        outcomes[result['outcome']] = outcomes.get(result['outcome'], 0) + 1
+        histogram[result['score']] = histogram.get(result['score'], 0) + 1
+
+    return {
+        'games': len(results),
+        'elapsed_seconds': round(elapsed, 3),
+        'games_per_second': round(len(results) / elapsed, 1) if elapsed else None,
+        'ticks_per_second': round(total_ticks / elapsed, 1) if elapsed else None,
+        'total_ticks': total_ticks,
+        'mean_game_seconds': round(total_ticks / len(results) / speed, 2) if results else 0,
+        'outcomes': outcomes,
+        'scores': {
+            'min': scores[0] if scores else 0,
+            'max': scores[-1] if scores else 0,
+            'mean': round(statistics.fmean(scores), 3) if scores else 0,
+            'median': statistics.median(scores) if scores else 0,
+            'p90': _percentile(scores, 0.9) if scores else 0,
+            'stdev': round(statistics.pstdev(scores), 3) if scores else 0,
+            'histogram': {str(score): histogram[score] for score in sorted(histogram)},
+        },
+    }
+
+
+def run_tournament(policy_name, difficulty, speed, seeds, workers=None, max_ticks=HEADLESS_MAX_TICKS):
+    """Play one game per seed across a process pool and return the report"""
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    chunks = [(policy_name, seeds[i:i + HEADLESS_CHUNK_SIZE], max_ticks)
+              for i in range(0, len(seeds), HEADLESS_CHUNK_SIZE)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        chunk_results = map(_play_chunk, chunks)
+        results = [result for chunk in chunk_results for result in chunk]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = [result for chunk in pool.imap(_play_chunk, chunks) for result in chunk]
+    elapsed = time.perf_counter() - start
+
+    report = {
+        'policy': policy_name,
+        'difficulty': difficulty,
+        'seeds': [seeds[0], seeds[-1]] if seeds else [],
+        'workers': workers,
+        'max_ticks': max_ticks,
+    }
+    report.update(summarize(results, elapsed, speed))
+    return report
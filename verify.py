@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Replay Verifier
+Re-simulates recorded sessions headless to accept or reject their scores
+
+Check a batch of replays across all cores (add --submit to record the
+accepted scores in the high score store):
+    python verify.py replays/*.replay --workers 8
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from constants import DIFFICULTY_CONFIG, GRID_COLS, GRID_ROWS, HEADLESS_CHUNK_SIZE, VERIFY_MAX_TICKS
+from replay import Replay, simulate
+
+
+DIFFICULTY_NAMES = {diff['name'] for diff in DIFFICULTY_CONFIG}
+
+
+class ScoreRejected(ValueError):
+    """A score whose replay doesn't reproduce it"""
+
+
+def verify_replay(replay, score=None):
+    """Check a replay (and optionally a claimed score); returns (accepted, reason)"""
+    if (replay.cols, replay.rows) != (GRID_COLS, GRID_ROWS):
+        return False, f'board is {replay.cols}x{replay.rows}, not {GRID_COLS}x{GRID_ROWS}'
+    if replay.difficulty not in DIFFICULTY_NAMES:
+        return False, f'unknown difficulty {replay.difficulty!r}'
+    if score is not None and score != replay.score:
+        return False, f'claimed score {score} but the replay records {replay.score}'
+    if replay.end_tick > VERIFY_MAX_TICKS:
+        return False, f'{replay.end_tick} ticks exceeds the {VERIFY_MAX_TICKS} tick limit'
+    # Every pickup takes at least one tick
+    if replay.score > replay.end_tick:
+        return False, f'score {replay.score} in only {replay.end_tick} ticks'
+
+    previous = -1
+    for tick, _ in replay.turns:
+        if tick <= previous or tick >= replay.end_tick:
+            return False, f'turn at tick {tick} is out of order'
+        previous = tick
+
+    engine = simulate(replay)
+    if not engine.game_over:
+        return False, f'game still running at tick {engine.ticks}'
+    if engine.ticks != replay.end_tick:
+        return False, f'game ended at tick {engine.ticks}, not {replay.end_tick}'
+    if engine.score != replay.score:
+        return False, f'simulated score {engine.score}, not {replay.score}'
+    return True, 'ok'
+
+
+def verify_file(path):
+    """Verify one replay file; returns a result dict"""
+    try:
+        replay = Replay.load(path)
+    except (OSError, ValueError, UnicodeDecodeError) as e:
+        return {'path': path, 'accepted': False, 'reason': f'unreadable: {e}'}
+    accepted, reason = verify_replay(replay)
+    return {'path': path, 'accepted': accepted, 'reason': reason, 'player': replay.player,
+            'difficulty': replay.difficulty, 'score': replay.score, 'ticks': replay.end_tick}
+
+
+def _verify_chunk(paths):
+    """Pool worker: verify a chunk of files"""
+    return [verify_file(path) for path in paths]
+
+
+def verify_files(paths, workers=None):
+    """Verify replay files across a process pool; returns the results in order and the elapsed time"""
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    chunks = [paths[i:i + HEADLESS_CHUNK_SIZE] for i in range(0, len(paths), HEADLESS_CHUNK_SIZE)]
+
+    start = time.perf_counter()
+    if workers == 1 or len(chunks) <= 1:
+        results = [result for chunk in map(_verify_chunk, chunks) for result in chunk]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = [result for chunk in pool.imap(_verify_chunk, chunks) for result in chunk]
+    return results, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify EcoSnake replays by re-simulating them")
+    parser.add_argument('replays', nargs='+', help="replay files")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--submit', action='store_true', help="add accepted scores to the high score store")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results, elapsed = verify_files(args.replays, args.workers)
+    accepted = [result for result in results if result['accepted']]
+    if args.submit:
+        from highscores import open_score_store
+        store = open_score_store()
+        for result in accepted:
+            store.submit(result['player'], result['score'], result['difficulty'])
+
+    total_ticks = sum(result['ticks'] for result in accepted)
+    report = {
+        'checked': len(results),
+        'accepted': len(accepted),
+        'rejected': len(results) - len(accepted),
+        'elapsed_seconds': round(elapsed, 3),
+        'replays_per_second': round(len(results) / elapsed, 1) if elapsed else None,
+        'ticks_per_second': round(total_ticks / elapsed, 1) if elapsed else None,
+        'rejections': [{'path': result['path'], 'reason': result['reason']}
+                       for result in results if not result['accepted']],
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 1 if report['rejected'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+EcoSnake Game - Background Writer
+Runs file and database writes on a worker thread so disk stalls never reach the UI
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def atomic_write_json(path, data):
+    """Write JSON to a temp file next to path and rename it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, mode)  # mkstemp creates files private to the user
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
+class BackgroundWriter:
+    """Queue of write jobs, keyed so that repeated writes coalesce.
+
+    submit() replaces any job still waiting under the same key, so only
+    the latest settings snapshot is written. A delay holds a job back and
+    restarts whenever the key is submitted again (debouncing); flush() and
+    close() run held jobs right away. Failed jobs are printed,
+    kept in errors and passed to on_error(key, error) on the worker
+    thread; the caller never waits on a write unless it calls flush().
+    """
+
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        self.errors = []
+        self._jobs = OrderedDict()
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='background-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, key, func, *args, delay=0):
+        """Queue func(*args) to run after delay seconds, dropping a not-yet-started job with the same key"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('writer is closed')
+            self._jobs.pop(key, None)
+            self._jobs[key] = (time.monotonic() + delay, func, args)
+            self._condition.notify_all()
+
+    def pending(self):
+        """Number of jobs queued or running"""
+        with self._condition:
+            return len(self._jobs) + self._busy
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._jobs:
+                        if self._closed:
+                            return
+                        self._condition.wait()
+                        continue
+                    key = min(self._jobs, key=lambda k: self._jobs[k][0])
+                    wait = self._jobs[key][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                _, func, args = self._jobs.pop(key)
+                self._busy = True
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Warning: Background write {key} failed: {e}")
+                self.errors.append((key, e))
+                if self.on_error:
+                    self.on_error(key, e)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _release_held(self):
+        for key, (_, func, args) in self._jobs.items():
+            self._jobs[key] = (0, func, args)
+        self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Run held jobs now and wait until every queued job has run; returns False on timeout"""
+        with self._condition:
+            self._release_held()
+            return self._condition.wait_for(lambda: not self._jobs and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        """Finish queued jobs and stop the worker"""
+        with self._condition:
+            self._closed = True
+            self._release_held()
+        self._thread.join(timeout)